@@ -0,0 +1,52 @@
+"""Сравнение разбора строк деталей лицевого счёта: прежнее последовательное
+сопоставление регулярными выражениями и табличный разбор.
+
+Запуск: python -m benchmarks.bench_account_detail
+"""
+
+import json
+import re
+import timeit
+from pathlib import Path
+
+from custom_components.guk_krasnodar._util import float_or_none
+from custom_components.guk_krasnodar.guk_krasnodar_api import (
+    FIELD_NAME_ACCOUNT_CHARGED,
+    _decode_account_detail,
+)
+
+ROWS = json.loads(
+    (Path(__file__).parent.parent / "tests/fixtures/account_detail.json").read_text()
+)["info"]
+
+FIELD_NAME_ACCOUNT_DEBT = re.compile(r"Задолженность \(основные услуги\)")
+FIELD_NAME_ACCOUNT_CRED = re.compile(r"Переплата \(основные услуги\)")
+FIELD_NAME_AREA = re.compile(r"Оплачиваемая площадь")
+
+
+def _sequential_regex(rows):
+    """Прежняя реализация"""
+    fields = {}
+    for detail in rows:
+        if FIELD_NAME_ACCOUNT_DEBT.match(detail["name"]):
+            fields["balance"] = float_or_none(detail.get("value"))
+        elif FIELD_NAME_ACCOUNT_CRED.match(detail["name"]):
+            fields["balance"] = float_or_none(detail.get("value"))
+        elif FIELD_NAME_ACCOUNT_CHARGED.match(detail["name"]):
+            fields["charged"] = float_or_none(detail.get("value"))
+        elif FIELD_NAME_AREA.match(detail["name"]):
+            fields["area"] = float_or_none(detail.get("value"))
+    return fields
+
+
+def main(number: int = 20000, repeat: int = 5) -> None:
+    for title, func in (
+        ("последовательное сопоставление", _sequential_regex),
+        ("табличный разбор", _decode_account_detail),
+    ):
+        best = min(timeit.repeat(lambda: func(ROWS), number=number, repeat=repeat))
+        print(f"{title}: {best / number * 1e6:.2f} мкс на лицевой счёт")
+
+
+if __name__ == "__main__":
+    main()
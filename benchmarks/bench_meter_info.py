@@ -0,0 +1,123 @@
+"""Сравнение разбора строк `info` счётчика: прежний двойной проход регулярными
+выражениями и разбор всех строк одним сопоставлением.
+
+Строки каждого счётчика уникальны (содержат показания), поэтому замеры
+выполняются на наборе различных счётчиков, как при обновлении сотен лицевых
+счетов. Даты в строках повторяются так же, как в ЛК: показания счётчиков
+одного лицевого счёта передаются в один день в пределах окна приёма
+показаний, даты поверки разбросаны по ближайшим годам.
+
+"Без кэша дат" - кэш дат очищается перед каждым обновлением всех счётчиков.
+
+Запуск: python -m benchmarks.bench_meter_info
+"""
+
+import random
+import re
+import time
+
+from custom_components.guk_krasnodar._util import int_or_none
+from custom_components.guk_krasnodar.guk_krasnodar_api import (
+    _parse_info_date,
+    _parse_meter_info,
+)
+
+FIELD_CURRENT_METRIC_INDICATION = re.compile(
+    r"Текущие показания: .*?(\d+).*? от .*?([\d.]+\d).*?"
+)
+FIELD_LAST_METRIC_INDICATION = re.compile(
+    r"Предыдущие показания: .*?(\d+).*? от .*?([\d.]+\d).*?"
+)
+
+
+def _parse_last_indication(value):
+    """Прежняя реализация (вызывалась дважды для каждого счётчика)"""
+    if value:
+        curr_match = next(
+            filter(None, (FIELD_CURRENT_METRIC_INDICATION.match(s) for s in value)),
+            None,
+        )
+        if curr_match:
+            return int_or_none(curr_match.group(1)), curr_match.group(2)
+
+        last_match = next(
+            filter(None, (FIELD_LAST_METRIC_INDICATION.match(s) for s in value)), None
+        )
+        if last_match:
+            return int_or_none(last_match.group(1)), last_match.group(2)
+
+    return None, None
+
+
+def _double_pass(info):
+    return _parse_last_indication(info)[0], _parse_last_indication(info)[1]
+
+
+def make_meter_infos(accounts: int, seed: int = 1) -> list:
+    """Строки `info` счётчиков лицевых счетов (от 1 до 4 счётчиков на счёт)"""
+    rnd = random.Random(seed)
+    infos = []
+    for _ in range(accounts):
+        previous_date = f"{rnd.randint(15, 25)}.01.2025"
+        current_date = f"{rnd.randint(15, 25)}.02.2025"
+        for _ in range(rnd.randint(1, 4)):
+            verification_date = (
+                f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}."
+                f"{rnd.randint(2026, 2035)}"
+            )
+            previous = rnd.randint(0, 99999)
+            current = previous + rnd.randint(0, 50)
+            infos.append(
+                [
+                    f"Дата следующей поверки: {verification_date}",
+                    rnd.choice(("Модель: Информация отсутствует", "Модель: СГВ-15")),
+                    "Состояние: В работе",
+                    f"Предыдущие показания: <strong>{previous}</strong> "
+                    f"от {previous_date}г.",
+                    f"Текущие показания: <strong>{current}</strong> "
+                    f"от {current_date}г.",
+                    f" Расчетный объем: {current - previous} "
+                    f"(расчетный объем без учета перерасчетов)",
+                ]
+            )
+    return infos
+
+
+def _parse_meter_info_cold(infos):
+    _parse_info_date.cache_clear()
+    for info in infos:
+        _parse_meter_info(info)
+
+
+def main(accounts: int = 800, rounds: int = 50) -> None:
+    infos = make_meter_infos(accounts)
+    # Строки в другом порядке разбираются построчно
+    shuffled = [sorted(info) for info in infos]
+
+    runs = {
+        "двойной проход регулярными выражениями": lambda: [
+            _double_pass(info) for info in infos
+        ],
+        "одно сопоставление без кэша дат": lambda: _parse_meter_info_cold(infos),
+        "одно сопоставление": lambda: [_parse_meter_info(info) for info in infos],
+        "построчный разбор (другой порядок строк)": lambda: [
+            _parse_meter_info(info) for info in shuffled
+        ],
+    }
+
+    # Замеры чередуются, чтобы колебания частоты процессора влияли на все
+    # варианты одинаково; берётся лучший результат
+    best = dict.fromkeys(runs, float("inf"))
+    for _ in range(rounds):
+        for title, run in runs.items():
+            start = time.perf_counter()
+            run()
+            best[title] = min(best[title], time.perf_counter() - start)
+
+    print(f"счётчиков: {len(infos)}")
+    for title, elapsed in best.items():
+        print(f"{title}: {elapsed / len(infos) * 1e6:.2f} мкс на счётчик")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Память, занимаемая 10 000 счётчиков: прежние изменяемые dataclass и
+неизменяемые снимки со слотами и интернированными строками.
+
+Запуск: python -m benchmarks.bench_model_memory
+"""
+
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any
+
+from custom_components.guk_krasnodar.model import Account, Meter
+
+METERS_COUNT = 10000
+METERS_PER_ACCOUNT = 4
+
+
+@dataclass
+class LegacyAccount:
+    id: str
+    company_id: str
+    number: str
+    address: str = ""
+    balance: float | None = None
+    charged: float | None = None
+    area: float | None = None
+    charged_period: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+    api: Any = None
+
+
+@dataclass
+class LegacyMeter:
+    id: str
+    title: str
+    detail: str = ""
+    info: Any = None
+    last_indication: int | None = None
+    last_indication_date: Any = None
+    push_allowed: bool | None = False
+    previous_indication: int | None = None
+    previous_indication_date: Any = None
+    next_verification_date: Any = None
+    model: str | None = None
+    status: str | None = None
+    calculated_volume: float | None = None
+    account: Any = None
+
+
+def _response():
+    """Строки ответа ЛК: каждая строка — отдельный объект, как после json.loads"""
+    return json.loads(
+        json.dumps(
+            [
+                {
+                    "id_company": "1",
+                    "id_account": str(index // METERS_PER_ACCOUNT),
+                    "id_meter": str(index),
+                    "title": f"{index % METERS_PER_ACCOUNT + 1}.ИПУ по ХВС",
+                    "detail": "",
+                    "status": "В работе",
+                    "info": ["Состояние: В работе", "Модель: Информация отсутствует"],
+                }
+                for index in range(METERS_COUNT)
+            ]
+        )
+    )
+
+
+def _build(account_cls, meter_cls, response):
+    accounts = {}
+    meters = []
+    for row in response:
+        account = accounts.get(row["id_account"])
+        if account is None:
+            account = accounts[row["id_account"]] = account_cls(
+                id=row["id_account"], company_id=row["id_company"], number="230123456"
+            )
+        meters.append(
+            meter_cls(
+                id=row["id_meter"],
+                title=row["title"],
+                detail=row["detail"],
+                info=row["info"],
+                status=row["status"],
+                last_indication=123,
+                account=account,
+            )
+        )
+    return meters
+
+
+def _measure(account_cls, meter_cls) -> int:
+    tracemalloc.start()
+    response = _response()
+    meters = _build(account_cls, meter_cls, response)
+    # Ответ ЛК больше не нужен: остаются созданные объекты и строки, на
+    # которые они ссылаются
+    del response
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(meters) == METERS_COUNT
+    return size
+
+
+def main() -> None:
+    for title, account_cls, meter_cls in (
+        ("изменяемые dataclass", LegacyAccount, LegacyMeter),
+        ("неизменяемые снимки со слотами", Account, Meter),
+    ):
+        size = _measure(account_cls, meter_cls)
+        print(
+            f"{title}: {size / 1024:.0f} КиБ на {METERS_COUNT} счётчиков "
+            f"({size / METERS_COUNT:.0f} байт на счётчик)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Стоимость подготовки записи состояния 1000 счётчиков: вычисление имени и
+атрибутов при каждом обращении и однократное отображение снимка данных.
+
+Каждый цикл обновления получает новые (равные прежним) снимки, как после
+ответа ЛК; в каждом десятом цикле показания счётчиков меняются.
+
+Запуск: python -m benchmarks.bench_state_write
+"""
+
+import time
+from types import SimpleNamespace
+
+from custom_components.guk_krasnodar.const import CONF_METERS, CONF_NAME_FORMAT
+from custom_components.guk_krasnodar.model import Account, AccountData, Meter
+from custom_components.guk_krasnodar.sensor import GUKKrasnodarMeter
+
+ENTITIES_COUNT = 1000
+METERS_PER_ACCOUNT = 4
+CYCLES = 50
+CHANGE_EVERY = 10
+
+ACCOUNT_CONFIG = {CONF_NAME_FORMAT: {CONF_METERS: "{type_cap} {title} № {code}"}}
+
+
+def _make_legacy_cls() -> type:
+    """Тот же класс объекта, но без сохранения отображения между обращениями"""
+    namespace = {}
+    for cls in reversed(GUKKrasnodarMeter.__mro__):
+        for name, value in vars(cls).items():
+            if isinstance(value, property) and hasattr(value.fget, "__wrapped__"):
+                namespace[name] = property(value.fget.__wrapped__)
+    return type("LegacyMeter", (GUKKrasnodarMeter,), namespace)
+
+
+def _snapshot(cycle: int) -> dict:
+    data = {}
+    for account_index in range(ENTITIES_COUNT // METERS_PER_ACCOUNT):
+        account = Account(
+            id=str(account_index), company_id="1", number=f"2301{account_index:05d}"
+        )
+        meters = {}
+        for meter_index in range(METERS_PER_ACCOUNT):
+            meter = Meter(
+                id=str(account_index * METERS_PER_ACCOUNT + meter_index),
+                title=f"{meter_index + 1}.ИПУ по ХВС",
+                info=("Состояние: В работе", "Модель: Информация отсутствует"),
+                last_indication=100 + cycle // CHANGE_EVERY,
+                status="В работе",
+                account=account,
+            )
+            meters[meter.code] = meter
+        data[account.code] = AccountData(account=account, meters=meters)
+    return data
+
+
+def _make_entities(entity_cls: type, data: dict) -> list:
+    coordinator = SimpleNamespace(data=data, last_update_success=True)
+    return [
+        entity_cls(coordinator, account_data.account, ACCOUNT_CONFIG, meter=meter)
+        for account_data in data.values()
+        for meter in account_data.meters.values()
+    ]
+
+
+def _measure(entity_cls: type, snapshots: list) -> tuple:
+    entities = _make_entities(entity_cls, snapshots[0])
+    writes = 0
+
+    started = time.perf_counter()
+    for data in snapshots:
+        for entity in entities:
+            entity.update_from_account_data(data[entity._account.code])
+            fingerprint = entity.state_fingerprint
+            if fingerprint == entity._state_fingerprint:
+                continue
+            entity._state_fingerprint = fingerprint
+            # Значения, которые читает async_write_ha_state
+            entity.unique_id, entity.name, entity.extra_state_attributes
+            writes += 1
+    elapsed = time.perf_counter() - started
+
+    return elapsed, writes
+
+
+def main() -> None:
+    snapshots = [_snapshot(cycle) for cycle in range(CYCLES)]
+
+    for title, entity_cls in (
+        ("вычисление при каждом обращении", _make_legacy_cls()),
+        ("отображение снимка данных", GUKKrasnodarMeter),
+    ):
+        elapsed, writes = _measure(entity_cls, snapshots)
+        per_cycle = elapsed / CYCLES * 1000
+        print(
+            f"{title}: {per_cycle:.2f} мс на цикл {ENTITIES_COUNT} объектов "
+            f"({elapsed / (CYCLES * ENTITIES_COUNT) * 1e6:.2f} мкс на объект, "
+            f"записей состояния: {writes})"
+        )
+
+
+if __name__ == "__main__":
+    main()
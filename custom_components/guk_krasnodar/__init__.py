@@ -2,6 +2,7 @@
 
 __all__ = (
     "CONFIG_SCHEMA",
+    "async_remove_entry",
     "async_unload_entry",
     "async_reload_entry",
     "async_setup",
@@ -20,24 +21,34 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady, ConfigEntryAuthFailed
 from homeassistant.helpers import config_validation as cv
 
-from ._base import UpdateDelegatorsDataType
+from ._base import GUKKrasnodarCoordinator, UpdateDelegatorsDataType
+from ._history import async_remove_history_store
+from ._metrics_view import async_register_metrics
+from ._pool import async_get_connection_pool
+from ._rate_limit import async_get_host_rate_limiter
+from ._registry import EntityRegistry
+from ._snapshot import async_remove_snapshot_store
+from ._statistics import async_remove_statistics_store
 from ._schema import CONFIG_ENTRY_SCHEMA
 from ._util import _find_existing_entry, mask_value, _make_log_prefix
 from .const import (
+    CONF_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RATE_LIMIT,
     CONF_USER_AGENT,
     DATA_API_OBJECTS,
+    DATA_COORDINATORS,
     DATA_ENTITIES,
     DATA_FINAL_CONFIG,
+    DATA_REGISTERED_SERVICES,
     DATA_UPDATE_DELEGATORS,
     DATA_UPDATE_LISTENERS,
     DATA_YAML_CONFIG,
     DOMAIN,
     SUPPORTED_PLATFORMS,
 )
-from .exceptions import SessionAPIException, EmptyResponse
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -187,57 +198,36 @@ async def async_setup_entry(
 
     _LOGGER.info(log_prefix + "Применение конфигурационной записи")
 
-    from .guk_krasnodar_api import GUKKrasnodarAPI
+    from .guk_krasnodar_api import API_URL, GUKKrasnodarAPI
+
+    # Ограничения общего для хоста ограничителя пересчитываются при выгрузке
+    rate_limiter = async_get_host_rate_limiter(hass, API_URL)
+    config_entry.async_on_unload(
+        rate_limiter.async_set_entry_limits(
+            entry_id,
+            rate=user_cfg[CONF_RATE_LIMIT],
+            max_concurrent=user_cfg[CONF_MAX_CONCURRENT_REQUESTS],
+        )
+    )
 
     api_object = GUKKrasnodarAPI(
         username=username,
         password=user_cfg[CONF_PASSWORD],
         user_agent=user_cfg[CONF_USER_AGENT],
+        cache_ttl=user_cfg[CONF_CACHE_TTL],
+        pool=async_get_connection_pool(hass),
+        rate_limiter=rate_limiter,
     )
 
-    try:
-        try:
-            await api_object.async_login()
-
-        except SessionAPIException as e:
-            log_message = log_prefix + "Ошибка авторизации: " + repr(e)
-            _LOGGER.error(log_message)
-            raise ConfigEntryAuthFailed(log_message)
-
-        accounts = None
-        for i in range(3):
-            _LOGGER.debug(log_prefix + "Ожидание перед запросом лицевых счетов")
-            await asyncio.sleep(1)
-
-            try:
-                accounts = await api_object.async_accounts()
-            except EmptyResponse:
-                _LOGGER.warning(
-                    log_prefix + "Получен пустой ответ на запрос лицевых счетов"
-                )
-            except SessionAPIException as e:
-                log_message = "Ошибка получения данных о лицевых счетах: " + str(e)
-                _LOGGER.error(log_prefix + log_message)
-                raise ConfigEntryNotReady(log_message)
-            else:
-                break
-
-        if accounts is None:
-            log_message = "Невозможно получить данные о лицевых счетах"
-            _LOGGER.error(log_prefix + log_message)
-            raise ConfigEntryNotReady(log_message)
-
-    except BaseException:
-        await api_object.async_close()
-        raise
-
-    if not accounts:
-        # Cancel setup because no accounts provided
-        _LOGGER.warning(log_prefix + "Лицевые счета не найдены")
-        await api_object.async_close()
-        return False
+    coordinator = GUKKrasnodarCoordinator(hass, config_entry, api_object, user_cfg)
+    config_entry.async_on_unload(
+        async_register_metrics(hass, entry_id, api_object.metrics)
+    )
 
-    _LOGGER.debug(log_prefix + f"Найдено {len(accounts)} лицевых счетов")
+    # Авторизация и получение данных выполняются в фоне после регистрации
+    # платформ, чтобы не задерживать запуск Home Assistant
+    if await coordinator.async_restore_snapshot():
+        _LOGGER.debug(log_prefix + "Использован сохранённый снимок данных")
 
     api_objects: Dict[str, "GUKKrasnodarAPI"] = hass_data.setdefault(
         DATA_API_OBJECTS, {}
@@ -245,9 +235,10 @@ async def async_setup_entry(
 
     # Create placeholders
     api_objects[entry_id] = api_object
-    hass_data.setdefault(DATA_ENTITIES, {})[entry_id] = {}
+    hass_data.setdefault(DATA_ENTITIES, {})[entry_id] = EntityRegistry()
     hass_data.setdefault(DATA_FINAL_CONFIG, {})[entry_id] = user_cfg
     hass.data.setdefault(DATA_UPDATE_DELEGATORS, {})[entry_id] = {}
+    hass_data.setdefault(DATA_COORDINATORS, {})[entry_id] = coordinator
 
     # Forward entry setup to sensor platform
     await hass.config_entries.async_forward_entry_setups(
@@ -291,20 +282,42 @@ async def async_unload_entry(
 
     unload_ok = all(await asyncio.gather(*tasks))
 
-    # Unload services
-    for service in hass.services.async_services_for_domain(DOMAIN):
-        hass.services.async_remove(DOMAIN, service)
-
     if unload_ok:
-        hass.data[DATA_API_OBJECTS].pop(entry_id)
+        api_object = hass.data[DATA_API_OBJECTS].pop(entry_id)
+        coordinator: GUKKrasnodarCoordinator = hass.data[DATA_COORDINATORS].pop(
+            entry_id
+        )
+        hass.data[DATA_ENTITIES].pop(entry_id)
         hass.data[DATA_FINAL_CONFIG].pop(entry_id)
 
+        # Службы объектов общие для всех записей; выгружаются вместе с последней
+        if not hass.data[DATA_COORDINATORS]:
+            for service in hass.services.async_services_for_domain(DOMAIN):
+                hass.services.async_remove(DOMAIN, service)
+            hass.data.pop(DATA_REGISTERED_SERVICES, None)
+
         cancel_listener = hass.data[DATA_UPDATE_LISTENERS].pop(entry_id)
         cancel_listener()
 
+        # Обновления записи (в том числе повторы первичного получения данных)
+        # останавливаются до закрытия сессии API; общий пул соединений
+        # закрывается только при остановке Home Assistant
+        await coordinator.async_shutdown()
+        await api_object.async_close()
+
         _LOGGER.info(log_prefix + "Интеграция выгружена")
 
     else:
         _LOGGER.warning(log_prefix + "При выгрузке конфигурации произошла ошибка")
 
     return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+) -> None:
+    """Remove GUK Krasnodar entry data"""
+    await async_remove_history_store(hass, config_entry.entry_id)
+    await async_remove_statistics_store(hass, config_entry.entry_id)
+    await async_remove_snapshot_store(hass, config_entry.entry_id)
@@ -1,24 +1,30 @@
 __all__ = (
     "make_common_async_setup_entry",
+    "GUKKrasnodarCoordinator",
     "GUKKrasnodarEntity",
+    "async_discover_entities",
     "async_refresh_api_data",
+    "async_register_platform_services",
     "async_register_update_delegator",
+    "get_supported_features",
+    "rendered_property",
     "UpdateDelegatorsDataType",
-    "EntitiesDataType",
     "SupportedServicesType",
 )
 
 import asyncio
 import logging
+import time
 from abc import abstractmethod
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 from typing import (
     Any,
     Callable,
     ClassVar,
     Dict,
+    Final,
     Generic,
-    Hashable,
     List,
     Mapping,
     Optional,
@@ -39,46 +45,68 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HassJob,
+    HomeAssistant,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import entity_platform
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType, StateType
-from homeassistant.util import as_local, utcnow
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
+from ._history import MeterHistorySync
+from ._planner import AccountRequestPlan, build_request_plan
+from ._polling import AdaptivePollingPolicy
+from ._registry import EntityRegistry
+from ._scheduler import async_get_refresh_scheduler
+from ._snapshot import SnapshotStore
+from ._statistics import MeterStatisticsBackfill
 from ._util import mask_value, with_auto_auth
 from .const import (
     ATTRIBUTION_RU,
     CONF_ACCOUNTS,
+    CONF_ACCOUNT_TIMEOUT,
+    CONF_ADAPTIVE_POLLING,
     CONF_DEV_PRESENTATION,
+    CONF_METERS,
     CONF_NAME_FORMAT,
-    DATA_API_OBJECTS,
+    CONF_PARALLEL_ACCOUNTS,
+    DATA_COORDINATORS,
     DATA_ENTITIES,
-    DATA_FINAL_CONFIG,
+    DATA_REGISTERED_SERVICES,
     DATA_UPDATE_DELEGATORS,
+    DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     FORMAT_VAR_ACCOUNT_CODE,
     FORMAT_VAR_CODE,
     SUPPORTED_PLATFORMS,
     FORMAT_VAR_ACCOUNT_NUMBER,
 )
+from .exceptions import AccessDenied, SessionAPIException
 from .guk_krasnodar_api import GUKKrasnodarAPI, API_URL
+from .model import AccountData
 
 if TYPE_CHECKING:
     from .model import Account
-    from homeassistant.helpers.entity_registry import RegistryEntry
 
 _LOGGER = logging.getLogger(__name__)
 
 _TGUKKrasnodarEntity = TypeVar("_TGUKKrasnodarEntity", bound="GUKKrasnodarEntity")
 
+SETUP_RETRY_DELAYS: Final = (5, 10, 20, 40, 80)
+
 AddEntitiesCallType = Callable[[List["GUKKrasnodarEntity"], bool], Any]
 UpdateDelegatorsDataType = Dict[
     str, Tuple[AddEntitiesCallType, Set[Type["GUKKrasnodarEntity"]]]
 ]
-EntitiesDataType = Dict[
-    Type["GUKKrasnodarEntity"], Dict[Hashable, "GUKKrasnodarEntity"]
-]
 
 
 def make_common_async_setup_entry(
@@ -95,6 +123,10 @@ def make_common_async_setup_entry(
             f"[{mask_value(config_entry.data[CONF_USERNAME])}]"
             f"[{current_entity_platform.domain}][setup] "
         )
+        async_register_platform_services(
+            hass, current_entity_platform, entity_cls, *args
+        )
+
         _LOGGER.debug(log_prefix + "Регистрация делегата обновлений")
 
         await async_register_update_delegator(
@@ -111,6 +143,62 @@ def make_common_async_setup_entry(
     return _async_setup_entry
 
 
+@callback
+def async_register_platform_services(
+    hass: HomeAssistant,
+    platform: entity_platform.EntityPlatform,
+    *entity_classes: Type["GUKKrasnodarEntity"],
+) -> None:
+    """Зарегистрировать службы объектов платформы однократно.
+
+    Службы объектов общие для всех платформ и конфигурационных записей
+    интеграции, поэтому повторная регистрация не выполняется.
+    """
+    registered_services: Set[str] = hass.data.setdefault(
+        DATA_REGISTERED_SERVICES, set()
+    )
+
+    for entity_cls in entity_classes:
+        for type_feature, services in entity_cls._supported_services.items():
+            features = None if type_feature is None else (int(type_feature[1]),)
+
+            for service, schema in services.items():
+                if service in registered_services:
+                    continue
+
+                _LOGGER.debug(f"[{platform.domain}] Регистрация службы {service}")
+                platform.async_register_entity_service(
+                    service,
+                    schema,
+                    "async_service_" + service,
+                    features,
+                    supports_response=SupportsResponse.OPTIONAL,
+                )
+                registered_services.add(service)
+
+
+@lru_cache(maxsize=None)
+def _get_supported_features(
+    entity_cls: Type["GUKKrasnodarEntity"], object_cls: type
+) -> int:
+    features = 0
+    for type_feature in entity_cls._supported_services:
+        if type_feature is None:
+            continue
+        check_cls, feature = type_feature
+        if issubclass(object_cls, check_cls):
+            features |= int(feature)
+
+    return features
+
+
+def get_supported_features(
+    entity_cls: Type["GUKKrasnodarEntity"], for_object: Any
+) -> int:
+    """Флаги возможностей объекта по карте служб класса сущности"""
+    return _get_supported_features(entity_cls, type(for_object))
+
+
 async def async_register_update_delegator(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -131,29 +219,442 @@ async def async_register_update_delegator(
         if len(update_delegators) != len(SUPPORTED_PLATFORMS):
             return
 
-        await async_refresh_api_data(hass, config_entry)
+        coordinator: "GUKKrasnodarCoordinator" = hass.data[DATA_COORDINATORS][entry_id]
 
+        @callback
+        def _async_discover_entities() -> None:
+            async_discover_entities(hass, config_entry)
 
-DEV_CLASSES_PROCESSED = set()
+        config_entry.async_on_unload(
+            coordinator.async_add_listener(_async_discover_entities)
+        )
 
+        # Объекты создаются из сохранённого снимка (при наличии), авторизация
+        # и первичное получение данных выполняются в фоне
+        if coordinator.data is not None:
+            async_discover_entities(hass, config_entry)
 
-async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry):
-    entry_id = config_entry.entry_id
+        config_entry.async_on_unload(coordinator.async_schedule_setup_refresh())
+        config_entry.async_on_unload(coordinator.async_schedule_refresh())
 
-    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][
-        entry_id
+
+def _get_update_interval(final_config: ConfigType) -> timedelta:
+    """Минимальный интервал обновления среди всех включённых лицевых счетов"""
+    account_configs = [final_config[CONF_DEFAULT]]
+    account_configs.extend((final_config.get(CONF_ACCOUNTS) or {}).values())
+
+    scan_intervals = [
+        account_config[CONF_SCAN_INTERVAL][config_key]
+        for account_config in account_configs
+        if account_config
+        for config_key in (CONF_ACCOUNTS, CONF_METERS)
+        if account_config[config_key] is not False
     ]
 
-    log_prefix_base = f"[{mask_value(config_entry.data[CONF_USERNAME])}]"
-    refresh_log_prefix = log_prefix_base + "[refresh] "
+    if not scan_intervals:
+        return timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    return min(scan_intervals)
+
+
+class GUKKrasnodarCoordinator(DataUpdateCoordinator[Dict[str, AccountData]]):
+    """Координатор обновления данных конфигурационной записи.
+
+    За один цикл обновления запрашивает список лицевых счетов, а также детали
+    и список счётчиков каждого лицевого счёта ровно один раз, после чего
+    результат раздаётся всем объектам конфигурационной записи.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: GUKKrasnodarAPI,
+        final_config: ConfigType,
+    ) -> None:
+        self.api = api
+        self.final_config = final_config
+        self.history_sync = MeterHistorySync(hass, config_entry, api)
+        self.statistics_backfill = MeterStatisticsBackfill(hass, config_entry, api)
+        self.snapshot = SnapshotStore(hass, config_entry.entry_id)
+        self.log_prefix = f"[{mask_value(config_entry.data[CONF_USERNAME])}][refresh] "
+        self.ready = asyncio.Event()
+        # Число пропущенных записей состояния объектов без изменений
+        self.skipped_state_writes = 0
+        self.refresh_interval = _get_update_interval(final_config)
+        self.scheduler = async_get_refresh_scheduler(hass)
+        self._remove_scheduled_refresh: Optional[CALLBACK_TYPE] = None
+        self._cancel_setup_refresh: Optional[CALLBACK_TYPE] = None
+        self._setup_refresh_task: Optional[asyncio.Task] = None
+        self._shutdown = False
+        self.polling = (
+            AdaptivePollingPolicy(self.refresh_interval)
+            if final_config[CONF_ADAPTIVE_POLLING]
+            else None
+        )
+
+        # Периодическое обновление выполняется общим планировщиком
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} {mask_value(config_entry.data[CONF_USERNAME])}",
+            update_interval=None,
+        )
+
+    @property
+    def next_refresh(self) -> Optional[datetime]:
+        """Время следующего запланированного обновления"""
+        return self.scheduler.get_next_run(self.config_entry.entry_id)
+
+    @property
+    def current_refresh_interval(self) -> timedelta:
+        """Интервал обновления с учётом адаптивного опроса"""
+        polling = self.polling
+        return self.refresh_interval if polling is None else polling.interval
+
+    @callback
+    def async_schedule_refresh(self) -> CALLBACK_TYPE:
+        """Запланировать периодическое обновление; возвращает функцию отмены"""
+        self.async_remove_scheduled_refresh()
+        self._remove_scheduled_refresh = self.scheduler.async_add(
+            self.config_entry.entry_id,
+            self.current_refresh_interval,
+            self.async_refresh,
+        )
+        return self.async_remove_scheduled_refresh
+
+    @callback
+    def async_remove_scheduled_refresh(self) -> None:
+        """Освободить место записи в общем планировщике"""
+        if self._remove_scheduled_refresh is not None:
+            self._remove_scheduled_refresh()
+            self._remove_scheduled_refresh = None
+
+    @callback
+    def async_schedule_setup_refresh(self) -> CALLBACK_TYPE:
+        """Запустить первичное получение данных; возвращает функцию отмены.
+
+        Без сохранённого снимка данные запрашиваются сразу. При наличии снимка
+        запуск откладывается на случайную задержку, чтобы после перезапуска
+        Home Assistant записи не обращались к ЛК одновременно.
+        """
+        config_entry = self.config_entry
+
+        @callback
+        def _async_start(*_) -> None:
+            self._cancel_setup_refresh = None
+            self._setup_refresh_task = config_entry.async_create_background_task(
+                self.hass,
+                self.async_setup_refresh(),
+                f"{DOMAIN} setup refresh {config_entry.entry_id}",
+            )
+
+        self.async_cancel_setup_refresh()
+
+        if self.data is None:
+            _async_start()
+            return self.async_cancel_setup_refresh
+
+        delay = self.scheduler.get_startup_delay()
+        _LOGGER.debug(
+            self.log_prefix
+            + f"Первичное получение данных через {delay.total_seconds():.0f} с"
+        )
+        self._cancel_setup_refresh = async_call_later(
+            self.hass, delay, HassJob(_async_start, cancel_on_shutdown=True)
+        )
+        return self.async_cancel_setup_refresh
+
+    @callback
+    def async_cancel_setup_refresh(self) -> None:
+        """Отменить отложенный запуск и повторы первичного получения данных"""
+        if self._cancel_setup_refresh is not None:
+            self._cancel_setup_refresh()
+            self._cancel_setup_refresh = None
+
+        task, self._setup_refresh_task = self._setup_refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+
+    @callback
+    def _async_set_refresh_interval(self, interval: timedelta) -> None:
+        entry_id = self.config_entry.entry_id
+        if self.scheduler.get_interval(entry_id) not in (None, interval):
+            _LOGGER.debug(self.log_prefix + f"Интервал обновления: {interval}")
+        self.scheduler.async_set_interval(entry_id, interval)
+
+    @callback
+    def async_notify_push(self) -> None:
+        """Показания переданы: ускорить обновление до их появления в ЛК"""
+        if self.polling is not None:
+            self._async_set_refresh_interval(self.polling.notify_push())
+
+    def get_account_config(self, account: "Account") -> Union[ConfigType, bool]:
+        account_config = (self.final_config.get(CONF_ACCOUNTS) or {}).get(account.code)
+
+        if account_config is None:
+            account_config = self.final_config[CONF_DEFAULT]
+
+        return account_config
+
+    async def async_restore_snapshot(self) -> Optional[Dict[str, AccountData]]:
+        """Загрузить сохранённый снимок данных в качестве текущих данных"""
+        data = await self.snapshot.async_load(self.api)
+        if data is not None:
+            _LOGGER.debug(
+                self.log_prefix + f"Загружен снимок данных ({len(data)} лицевых счетов)"
+            )
+            self.data = data
+        return data
+
+    async def async_setup_refresh(self) -> None:
+        """Первичное получение данных после настройки конфигурационной записи.
+
+        До первого успешного обновления попытки повторяются с нарастающей
+        задержкой (аналогично `ConfigEntryNotReady`). При отказе в авторизации
+        повторы прекращаются, а координатор запускает повторную аутентификацию
+        (аналогично `ConfigEntryAuthFailed`).
+        """
+        _LOGGER.info(self.log_prefix + "Запуск первичного получения данных")
+
+        attempt = 0
+        while True:
+            await self.async_refresh()
+
+            if self.last_update_success:
+                break
+
+            if isinstance(self.last_exception, ConfigEntryAuthFailed):
+                return
+
+            delay = SETUP_RETRY_DELAYS[min(attempt, len(SETUP_RETRY_DELAYS) - 1)]
+            attempt += 1
+            _LOGGER.warning(
+                self.log_prefix + f"Данные не получены, повтор через {delay} с"
+            )
+            await asyncio.sleep(delay)
+
+        _LOGGER.debug(self.log_prefix + "Первичное получение данных завершено")
+        self.ready.set()
+
+    async def async_shutdown(self) -> None:
+        """Остановить обновления записи и сохранить состояние.
+
+        Вызывается при выгрузке записи до закрытия сессии API (и повторно
+        из обработчиков выгрузки Home Assistant, где ничего не делает).
+        """
+        if self._shutdown:
+            return
+        self._shutdown = True
+
+        self.async_cancel_setup_refresh()
+        self.async_remove_scheduled_refresh()
+        self.statistics_backfill.async_cancel()
+        await super().async_shutdown()
+        await self.history_sync.async_save()
+        await self.statistics_backfill.async_save()
+        await self.snapshot.async_save()
+
+    async def _async_update_account_bounded(
+        self,
+        semaphore: asyncio.Semaphore,
+        account_plan: AccountRequestPlan,
+        previous_account_data: Optional[AccountData],
+    ) -> AccountData:
+        account = account_plan.account
+        account_timeout = self.final_config[CONF_ACCOUNT_TIMEOUT].total_seconds()
+
+        async with semaphore:
+            try:
+                async with asyncio.timeout(account_timeout):
+                    return await self._async_update_account(
+                        account_plan, previous_account_data
+                    )
+            except TimeoutError:
+                _LOGGER.warning(
+                    self.log_prefix
+                    + f"[{mask_value(account.code)}] "
+                    + f"Превышено время обновления лицевого счёта ({account_timeout} с)"
+                )
+                return previous_account_data or AccountData(account=account)
+
+    async def _async_update_account(
+        self,
+        account_plan: AccountRequestPlan,
+        previous_account_data: Optional[AccountData],
+    ) -> AccountData:
+        api = self.api
+        account = account_plan.account
+        account_log_prefix = self.log_prefix + f"[{mask_value(account.code)}] "
+
+        if account_plan.detail:
+            try:
+                account = await with_auto_auth(
+                    api, api.async_update_account_detail, account
+                )
+            except SessionAPIException as e:
+                _LOGGER.warning(
+                    account_log_prefix + f"Ошибка получения деталей: {repr(e)}"
+                )
+                if previous_account_data is not None:
+                    account = previous_account_data.account
+
+        meters = None
+        if account_plan.meters:
+            try:
+                meters = {
+                    meter.code: meter
+                    for meter in await with_auto_auth(api, api.async_meters, account)
+                }
+            except SessionAPIException as e:
+                _LOGGER.warning(
+                    account_log_prefix + f"Ошибка получения счётчиков: {repr(e)}"
+                )
+                if previous_account_data is not None:
+                    meters = previous_account_data.meters
+
+        meter_history = None
+        if meters and account_plan.meter_history:
+            try:
+                meter_history = await with_auto_auth(
+                    api,
+                    self.history_sync.async_sync_account,
+                    account,
+                    meters.values(),
+                )
+            except SessionAPIException as e:
+                _LOGGER.warning(
+                    account_log_prefix
+                    + f"Ошибка получения истории показаний: {repr(e)}"
+                )
+
+        return AccountData(account=account, meters=meters, meter_history=meter_history)
+
+    async def _async_update_data(self) -> Dict[str, AccountData]:
+        success = False
+        started_at = time.monotonic()
+        try:
+            # Собственный бюджет повторов на каждый цикл обновления
+            with self.api.retry_policy.budget_scope():
+                data = await self._async_fetch_data()
+            success = True
+            return data
+        finally:
+            self.api.metrics.record_refresh(time.monotonic() - started_at, success)
+
+    async def _async_fetch_data(self) -> Dict[str, AccountData]:
+        api = self.api
+        previous_data = self.data or {}
+
+        if not api.authorized:
+            try:
+                await api.async_login()
+            except AccessDenied as e:
+                raise ConfigEntryAuthFailed(f"Ошибка авторизации: {e}") from e
+            except SessionAPIException as e:
+                raise UpdateFailed(f"Ошибка авторизации: {e}") from e
 
-    _LOGGER.info(refresh_log_prefix + "Запуск обновления связанных с профилем данных")
+        try:
+            accounts = await with_auto_auth(api, api.async_accounts)
+        except SessionAPIException as e:
+            raise UpdateFailed(f"Ошибка получения лицевых счетов: {e}") from e
+
+        if not accounts:
+            _LOGGER.warning(self.log_prefix + "Лицевые счета не найдены")
+
+        plan = build_request_plan(accounts, self.get_account_config)
+        _LOGGER.debug(
+            self.log_prefix
+            + f"План запросов: {plan.requests_count} для {len(plan.accounts)} "
+            + f"лицевых счетов, пропущено лицевых счетов: {plan.skipped_count}"
+        )
+
+        # Лицевые счета обновляются параллельно с ограничением ширины, поэтому
+        # длительность цикла определяется самым медленным лицевым счётом
+        semaphore = asyncio.Semaphore(self.final_config[CONF_PARALLEL_ACCOUNTS])
+        accounts_data = await asyncio.gather(
+            *(
+                self._async_update_account_bounded(
+                    semaphore,
+                    account_plan,
+                    previous_data.get(account_plan.account.code),
+                )
+                for account_plan in plan.accounts
+            )
+        )
+
+        data: Dict[str, AccountData] = {
+            account_data.account.code: account_data for account_data in accounts_data
+        }
+
+        self.snapshot.async_schedule_save(data)
+
+        history_data = {
+            code: account_data
+            for code, account_data in data.items()
+            if account_data.meter_history is not None
+        }
+        if history_data:
+            self.statistics_backfill.async_schedule(history_data)
+
+        if api.pool is not None:
+            _LOGGER.debug(self.log_prefix + f"Пул соединений: {api.pool.get_stats()}")
+
+        if self.polling is not None:
+            self._async_set_refresh_interval(self.polling.update(self.data, data))
+
+        return data
+
+
+async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry):
+    coordinator: GUKKrasnodarCoordinator = hass.data[DATA_COORDINATORS][
+        config_entry.entry_id
+    ]
+
+    _LOGGER.info(
+        coordinator.log_prefix + "Запуск обновления связанных с профилем данных"
+    )
+
+    await coordinator.async_refresh()
+
+
+DEV_CLASSES_PROCESSED = set()
+
+
+def _make_entities_collector(
+    target: List["GUKKrasnodarEntity"],
+) -> AddEntitiesCallType:
+    @callback
+    def _async_collect_entities(
+        new_entities: List["GUKKrasnodarEntity"], update_before_add: bool = False
+    ) -> None:
+        target.extend(new_entities)
+
+    return _async_collect_entities
+
+
+@callback
+def async_discover_entities(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    entry_id = config_entry.entry_id
+
+    update_delegators: Optional[UpdateDelegatorsDataType] = hass.data[
+        DATA_UPDATE_DELEGATORS
+    ].get(entry_id)
 
     if not update_delegators:
         return
 
-    entities: EntitiesDataType = hass.data[DATA_ENTITIES][entry_id]
-    final_config: ConfigType = dict(hass.data[DATA_FINAL_CONFIG][entry_id])
+    coordinator: GUKKrasnodarCoordinator = hass.data[DATA_COORDINATORS][entry_id]
+
+    if not coordinator.last_update_success or coordinator.data is None:
+        return
+
+    log_prefix_base = f"[{mask_value(config_entry.data[CONF_USERNAME])}]"
+    refresh_log_prefix = log_prefix_base + "[refresh] "
+
+    entities: EntityRegistry = hass.data[DATA_ENTITIES][entry_id]
+    final_config = coordinator.final_config
 
     dev_presentation = final_config.get(CONF_DEV_PRESENTATION)
     dev_log_prefix = log_prefix_base + "[dev] "
@@ -165,38 +666,23 @@ async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry)
             dev_log_prefix + "Конечная конфигурация:\n" + pformat(final_config)
         )
 
-    tasks = []
-
-    async def _wrap_update_task(update_task):
-        try:
-            return await update_task
-        except BaseException as task_exception:
-            _LOGGER.exception(
-                f"Error occurred during task execution: {repr(task_exception)}",
-                exc_info=task_exception,
-            )
-            return None
-
-    accounts_config = final_config.get(CONF_ACCOUNTS) or {}
-    account_default_config = final_config[CONF_DEFAULT]
+    refreshed_count = 0
 
-    api: "GUKKrasnodarAPI" = hass.data[DATA_API_OBJECTS][entry_id]
-    accounts = await with_auto_auth(api, api.async_accounts)
+    # Новые объекты всех лицевых счетов добавляются одним вызовом на платформу
+    new_entities: Dict[str, List["GUKKrasnodarEntity"]] = {
+        platform: [] for platform in update_delegators
+    }
 
-    for account in accounts:
-        account_config = accounts_config.get(account.code)
+    for account_data in coordinator.data.values():
+        account = account_data.account
+        account_config = coordinator.get_account_config(account)
         account_log_prefix_base = refresh_log_prefix + f"[{mask_value(account.code)}]"
 
-        if account_config is None:
-            account_config = account_default_config
-
         if account_config is False:
             continue
 
-        # @todo вероятно, не нужно делать запрос по деталям когда счёт отключен
-        await _wrap_update_task(account.api_update_account_detail())
-
-        for platform, (async_add_entities, entity_classes) in update_delegators.items():
+        for platform, (_, entity_classes) in update_delegators.items():
+            async_collect_entities = _make_entities_collector(new_entities[platform])
             platform_log_prefix_base = account_log_prefix_base + f"[{platform}]"
             for entity_cls in entity_classes:
                 cls_log_prefix_base = (
@@ -219,33 +705,37 @@ async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry)
 
                     DEV_CLASSES_PROCESSED.add(dev_key)
 
-                current_entities = entities.setdefault(entity_cls, {})
+                try:
+                    entity_cls.async_refresh_accounts(
+                        entities,
+                        account_data,
+                        coordinator,
+                        account_config,
+                        async_collect_entities,
+                    )
+                except BaseException as task_exception:
+                    _LOGGER.exception(
+                        f"Error occurred during task execution: {repr(task_exception)}",
+                        exc_info=task_exception,
+                    )
+                else:
+                    refreshed_count += 1
 
-                _LOGGER.debug(
-                    cls_log_prefix_base + "[update] Планирование процедуры обновления"
-                )
+    added_count = 0
+    for platform, platform_new_entities in new_entities.items():
+        if platform_new_entities:
+            update_delegators[platform][0](platform_new_entities, False)
+            added_count += len(platform_new_entities)
 
-                tasks.append(
-                    hass.async_create_task(
-                        _wrap_update_task(
-                            entity_cls.async_refresh_accounts(
-                                current_entities,
-                                account,
-                                config_entry,
-                                account_config,
-                                async_add_entities,
-                            )
-                        )
-                    )
-                )
+    if added_count:
+        _LOGGER.debug(refresh_log_prefix + f"Добавлено новых объектов: {added_count}")
 
-    if tasks:
-        _LOGGER.info(
+    if refreshed_count:
+        _LOGGER.debug(
             refresh_log_prefix
-            + "Выполняется действий по обновлению : "
-            + str(len(tasks))
+            + "Выполнено действий по обновлению : "
+            + str(refreshed_count)
         )
-        await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
 
     else:
         _LOGGER.warning(
@@ -264,6 +754,26 @@ class NameFormatDict(dict):
         return "{{" + str(key) + "}}"
 
 
+def rendered_property(func: Callable[[Any], Any]) -> property:
+    """Свойство, вычисляемое один раз для текущего снимка данных объекта.
+
+    Значение сбрасывается при смене данных, от которых зависит отображение
+    объекта (`render_source`).
+    """
+    key = func.__name__
+
+    @wraps(func)
+    def _get_rendered(self: "GUKKrasnodarEntity") -> Any:
+        rendered = self._get_rendered()
+        try:
+            return rendered[key]
+        except KeyError:
+            value = rendered[key] = func(self)
+            return value
+
+    return property(_get_rendered)
+
+
 _TAccount = TypeVar("_TAccount", bound="Account")
 
 SupportedServicesType = Mapping[
@@ -272,25 +782,32 @@ SupportedServicesType = Mapping[
 ]
 
 
-class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
+class GUKKrasnodarEntity(
+    CoordinatorEntity[GUKKrasnodarCoordinator], Generic[_TAccount]
+):
     config_key: ClassVar[str] = NotImplemented
 
     _supported_services: ClassVar[SupportedServicesType] = {}
 
     _attr_should_poll = False
 
-    @property
+    @rendered_property
     def entity_id_prefix(self) -> str:
         return f"{DOMAIN}_{self._account.code}"
 
     def __init__(
         self,
+        coordinator: GUKKrasnodarCoordinator,
         account: _TAccount,
         account_config: ConfigType,
     ) -> None:
+        super().__init__(coordinator)
         self._account: _TAccount = account
         self._account_config: ConfigType = account_config
-        self._entity_updater = None
+        self._state_fingerprint: Optional[Tuple[Any, ...]] = None
+        self._skipped_state_writes = 0
+        self._rendered: Dict[str, Any] = {}
+        self._rendered_source: Optional[Tuple[Any, ...]] = None
 
     @property
     def api_hostname(self) -> str:
@@ -324,7 +841,7 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
     # Base overrides
     #################################################################################
 
-    @property
+    @rendered_property
     def extra_state_attributes(self):
         """Return the attribute(s) of the sensor"""
 
@@ -335,7 +852,7 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
 
         return attributes
 
-    @property
+    @rendered_property
     def name(self) -> Optional[str]:
         name_format_values = {
             key: ("" if value is None else str(value))
@@ -359,28 +876,28 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
 
     async def async_added_to_hass(self) -> None:
         _LOGGER.info(self.log_prefix + "Adding to HomeAssistant")
-        self.updater_restart()
-        self.register_supported_services()
+        await super().async_added_to_hass()
+        # Состояние записывается платформой сразу после добавления
+        self._state_fingerprint = self.state_fingerprint
+
+        # Идентификатор объекта мог измениться при регистрации
+        entities = self._entity_registry
+        if entities is not None:
+            entities.update_entity_id(self)
 
     async def async_will_remove_from_hass(self) -> None:
         _LOGGER.info(self.log_prefix + "Removing from HomeAssistant")
-        self.updater_stop()
-
-        registry_entry: Optional["RegistryEntry"] = self.registry_entry
-        if registry_entry:
-            entry_id: Optional[str] = registry_entry.config_entry_id
-            if entry_id:
-                data_entities: EntitiesDataType = self.hass.data[DATA_ENTITIES][
-                    entry_id
-                ]
-                cls_entities = data_entities.get(self.__class__)
-                if cls_entities:
-                    remove_indices = []
-                    for idx, entity in enumerate(cls_entities):
-                        if self is entity:
-                            remove_indices.append(idx)
-                    for idx in remove_indices:
-                        cls_entities.pop(idx)
+        await super().async_will_remove_from_hass()
+
+        entities = self._entity_registry
+        if entities is not None:
+            entities.remove(self)
+
+    @property
+    def _entity_registry(self) -> Optional[EntityRegistry]:
+        return self.hass.data.get(DATA_ENTITIES, {}).get(
+            self.coordinator.config_entry.entry_id
+        )
 
     #################################################################################
     # Updater management API
@@ -390,46 +907,53 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
     def log_prefix(self) -> str:
         return f"[{self.config_key}][{self.entity_id or '<no entity ID>'}] "
 
-    def updater_stop(self) -> None:
-        if self._entity_updater is not None:
-            _LOGGER.debug(self.log_prefix + "Остановка планировщика обновлений")
-            self._entity_updater()
-            self._entity_updater = None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        account_data = (self.coordinator.data or {}).get(self._account.code)
 
-    def updater_restart(self) -> None:
-        log_prefix = self.log_prefix
-        scan_interval = self.scan_interval
+        if account_data is None:
+            _LOGGER.debug(self.log_prefix + "Данные лицевого счёта не получены")
+            return
 
-        self.updater_stop()
+        if not self.update_from_account_data(account_data):
+            return
 
-        async def _update_entity(*_):
-            nonlocal self
-            _LOGGER.debug(log_prefix + "Выполнение запланированной задачи обновления")
-            await self.async_update_ha_state(force_refresh=True)
+        fingerprint = self.state_fingerprint
+        if fingerprint == self._state_fingerprint:
+            self._skipped_state_writes += 1
+            self.coordinator.skipped_state_writes += 1
+            return
 
-        _LOGGER.debug(
-            log_prefix + f"Starting updater "
-            f"(interval: {scan_interval.total_seconds()} seconds, "
-            f"next call: {as_local(utcnow()) + scan_interval})"
-        )
-        self._entity_updater = async_track_time_interval(
-            self.hass,
-            _update_entity,
-            scan_interval,
+        self._state_fingerprint = fingerprint
+        self.async_write_ha_state()
+
+    @property
+    def state_fingerprint(self) -> Tuple[Any, ...]:
+        """Значения, изменение которых требует записи состояния"""
+        return (
+            self.available,
+            self.name,
+            self.state,
+            self.sensor_related_attributes,
         )
 
-    async def updater_execute(self) -> None:
-        self.updater_stop()
-        try:
-            await self.async_update_ha_state(force_refresh=True)
-        finally:
-            self.updater_restart()
+    @property
+    def skipped_state_writes(self) -> int:
+        return self._skipped_state_writes
 
-    async def async_update(self) -> None:
-        await with_auto_auth(
-            self._account.api,
-            self.async_update_internal,
-        )
+    @property
+    def render_source(self) -> Tuple[Any, ...]:
+        """Данные, от которых зависит отображение объекта"""
+        return self.name_format, self._account
+
+    def _get_rendered(self) -> Dict[str, Any]:
+        source = self.render_source
+        # Снимки неизменяемы: сравнение совпадающих объектов выполняется по
+        # идентичности, а равные копии не требуют повторного отображения
+        if source != self._rendered_source:
+            self._rendered = {}
+            self._rendered_source = source
+        return self._rendered
 
     #################################################################################
     # Functional base for inherent classes
@@ -437,14 +961,14 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
 
     @classmethod
     @abstractmethod
-    async def async_refresh_accounts(
+    def async_refresh_accounts(
         cls: Type[_TGUKKrasnodarEntity],
-        entities: Dict[Hashable, _TGUKKrasnodarEntity],
-        account: "Account",
-        config_entry: ConfigEntry,
+        entities: EntityRegistry,
+        account_data: AccountData,
+        coordinator: GUKKrasnodarCoordinator,
         account_config: ConfigType,
         async_add_entities: Callable[[List[_TGUKKrasnodarEntity], bool], Any],
-    ):
+    ) -> None:
         raise NotImplementedError
 
     #################################################################################
@@ -452,7 +976,8 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
     #################################################################################
 
     @abstractmethod
-    async def async_update_internal(self) -> None:
+    def update_from_account_data(self, account_data: AccountData) -> bool:
+        """Обновить объект данными координатора; `False` - запись состояния не нужна"""
         raise NotImplementedError
 
     @property
@@ -479,23 +1004,3 @@ class GUKKrasnodarEntity(Entity, Generic[_TAccount]):
     @abstractmethod
     def unique_id(self) -> str:
         raise NotImplementedError
-
-    def register_supported_services(self, for_object: Optional[Any] = None) -> None:
-        for type_feature, services in self._supported_services.items():
-            result, features = (
-                (True, None)
-                if type_feature is None
-                else (isinstance(for_object, type_feature[0]), (int(type_feature[1]),))
-            )
-
-            if result:
-                for service, schema in services.items():
-                    service_name = "async_service_" + service
-                    _LOGGER.debug("Registering service: %s", service_name)
-                    self.platform.async_register_entity_service(
-                        service,
-                        schema,
-                        service_name,
-                        features,
-                        supports_response=SupportsResponse.OPTIONAL,
-                    )
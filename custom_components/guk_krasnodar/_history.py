@@ -0,0 +1,173 @@
+__all__ = (
+    "MeterHistorySync",
+    "async_remove_history_store",
+)
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Final, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .guk_krasnodar_api import GUKKrasnodarAPI
+from .model import Account, Meter, MeterHistoryRow
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_STORAGE_VERSION: Final = 1
+HISTORY_SAVE_DELAY: Final = 10
+DEFAULT_HISTORY_INITIAL_PERIOD: Final = timedelta(days=365)
+
+
+def _get_history_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history")
+
+
+async def async_remove_history_store(hass: HomeAssistant, entry_id: str) -> None:
+    await _get_history_store(hass, entry_id).async_remove()
+
+
+def _make_mark_key(account: Account, meter_code: str) -> str:
+    return f"{account.code}:{meter_code}"
+
+
+def _get_row_key(row: MeterHistoryRow) -> tuple:
+    """Идентичность строки истории в пределах даты (ЛК не передаёт
+    идентификатор строки, а показания могут передаваться несколько раз в день)"""
+    return row.value, row.volume, row.period_name, row.info
+
+
+# Дата отметки и строки, полученные на эту дату (`None` - все строки)
+_MarkType = Tuple[Optional[date], Optional[FrozenSet[tuple]]]
+
+
+class MeterHistorySync:
+    """Инкрементальная синхронизация истории показаний счётчиков.
+
+    Для каждой пары (лицевой счёт, счётчик) хранится дата самой новой
+    полученной строки истории и строки, полученные на эту дату; каждый цикл
+    запрашивает строки начиная с этой даты и пропускает уже полученные.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: GUKKrasnodarAPI,
+        initial_period: timedelta = DEFAULT_HISTORY_INITIAL_PERIOD,
+    ) -> None:
+        self.api = api
+        self.initial_period = initial_period
+        self._store = _get_history_store(hass, config_entry.entry_id)
+        self._marks: Optional[Dict[str, Union[str, dict]]] = None
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        if self._marks is None:
+            data = await self._store.async_load() or {}
+            self._marks = dict(data.get("marks") or {})
+
+    def _data_to_save(self) -> dict:
+        self._dirty = False
+        return {"marks": dict(self._marks or {})}
+
+    async def async_save(self) -> None:
+        """Немедленно сохранить отметки, если есть несохранённые изменения"""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    def get_mark(self, account: Account, meter_code: str) -> Optional[date]:
+        return self._get_mark(account, meter_code)[0]
+
+    def _get_mark(self, account: Account, meter_code: str) -> _MarkType:
+        value = (self._marks or {}).get(_make_mark_key(account, meter_code))
+        if value is None:
+            return None, None
+        if isinstance(value, str):
+            # Отметка прежнего формата: строки на дату отметки считаются полученными
+            return date.fromisoformat(value), None
+        return date.fromisoformat(value["date"]), frozenset(
+            tuple(row_key) for row_key in value["rows"]
+        )
+
+    def _set_mark(
+        self,
+        account: Account,
+        meter_code: str,
+        mark_date: date,
+        row_keys: Iterable[tuple],
+    ) -> None:
+        self._marks[_make_mark_key(account, meter_code)] = {
+            "date": mark_date.isoformat(),
+            "rows": [list(row_key) for row_key in row_keys],
+        }
+
+    async def async_sync_account(
+        self, account: Account, meters: Iterable[Meter]
+    ) -> Dict[str, List[MeterHistoryRow]]:
+        """Получить строки истории, появившиеся после сохранённых отметок"""
+        await self.async_load()
+
+        meters = list(meters)
+        if not meters:
+            return {}
+
+        now = dt_util.utcnow()
+        marks = {meter.code: self._get_mark(account, meter.code) for meter in meters}
+        mark_dates = [mark_date for mark_date, _ in marks.values()]
+
+        # Один запрос на все счётчики лицевого счёта, начиная с самой старой отметки
+        if None in mark_dates:
+            begin = now - self.initial_period
+        else:
+            begin = datetime.combine(min(mark_dates), time(), timezone.utc)
+
+        new_rows: Dict[str, List[MeterHistoryRow]] = {
+            meter.code: [] for meter in meters
+        }
+
+        # История загружается с собственным бюджетом повторов
+        with self.api.retry_policy.budget_scope():
+            async for row in self.api.async_iter_meter_history(
+                account, meters, begin, now, descending=False
+            ):
+                if row.date is None or row.meter_id not in new_rows:
+                    continue
+
+                mark_date, seen_rows = marks[row.meter_id]
+                if mark_date is not None and (
+                    row.date < mark_date
+                    or row.date == mark_date
+                    and (seen_rows is None or _get_row_key(row) in seen_rows)
+                ):
+                    continue
+
+                new_rows[row.meter_id].append(row)
+
+        changed = False
+        for meter_code, rows in new_rows.items():
+            if not rows:
+                continue
+            mark_date, seen_rows = marks[meter_code]
+            last_date = max(row.date for row in rows)
+            row_keys = [_get_row_key(row) for row in rows if row.date == last_date]
+            if last_date == mark_date:
+                row_keys = [*seen_rows, *row_keys]
+            self._set_mark(account, meter_code, last_date, row_keys)
+            changed = True
+
+        if changed:
+            self._dirty = True
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+        _LOGGER.debug(
+            f"История показаний по счету {account.company_id} {account.id}: "
+            f"новых строк {sum(map(len, new_rows.values()))} "
+            f"(с {begin.date().isoformat()})"
+        )
+
+        return new_rows
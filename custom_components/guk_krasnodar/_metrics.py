@@ -0,0 +1,235 @@
+__all__ = (
+    "ApiMetrics",
+    "EndpointMetrics",
+    "Histogram",
+    "render_metrics",
+)
+
+import bisect
+from typing import Dict, Final, Iterable, List, Mapping, Optional, Tuple
+
+# Границы корзин гистограмм, секунды
+LATENCY_BUCKETS: Final = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REFRESH_BUCKETS: Final = (1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+METRICS_PREFIX: Final = "guk_krasnodar"
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин (как в Prometheus)"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # Последняя корзина - значения больше верхней границы (+Inf)
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative_counts(self) -> List[int]:
+        result, total = [], 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля линейной интерполяцией внутри корзины"""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        lower_bound, total = 0.0, 0
+        for index, count in enumerate(self.counts):
+            if total + count >= rank and count:
+                if index == len(self.buckets):
+                    # Значение за пределами верхней границы
+                    return self.buckets[-1]
+                upper_bound = self.buckets[index]
+                return lower_bound + (upper_bound - lower_bound) * (
+                    (rank - total) / count
+                )
+            total += count
+            if index < len(self.buckets):
+                lower_bound = self.buckets[index]
+
+        return self.buckets[-1]
+
+
+class EndpointMetrics:
+    """Показатели запросов к одной точке API"""
+
+    __slots__ = ("requests", "errors", "latency", "bytes_received")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.bytes_received = 0
+
+
+class ApiMetrics:
+    """Показатели работы экземпляра API и циклов обновления.
+
+    Каждая попытка запроса к ЛК (включая повторы) учитывается отдельно.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.logins = 0
+        self.refresh = Histogram(REFRESH_BUCKETS)
+        self.refresh_failures = 0
+        self.last_refresh_duration: Optional[float] = None
+
+    def _get_endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_request(
+        self,
+        endpoint: str,
+        duration: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        metrics = self._get_endpoint(endpoint)
+        metrics.requests += 1
+        metrics.latency.observe(duration)
+        if error is not None:
+            error_name = type(error).__name__
+            metrics.errors[error_name] = metrics.errors.get(error_name, 0) + 1
+
+    def record_bytes(self, endpoint: str, size: int) -> None:
+        self._get_endpoint(endpoint).bytes_received += size
+
+    def record_login(self) -> None:
+        self.logins += 1
+
+    def record_refresh(self, duration: float, success: bool = True) -> None:
+        self.refresh.observe(duration)
+        self.last_refresh_duration = duration
+        if not success:
+            self.refresh_failures += 1
+
+    @property
+    def requests_count(self) -> int:
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors_count(self) -> int:
+        return sum(sum(metrics.errors.values()) for metrics in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        return sum(metrics.bytes_received for metrics in self.endpoints.values())
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Квантиль времени ответа по всем точкам API"""
+        latency = Histogram(LATENCY_BUCKETS)
+        for metrics in self.endpoints.values():
+            latency.merge(metrics.latency)
+        return latency.quantile(q)
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels.items()
+    )
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _MetricsWriter:
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+
+    def header(self, name: str, metric_type: str, help_text: str) -> None:
+        self._lines.append(f"# HELP {METRICS_PREFIX}_{name} {help_text}")
+        self._lines.append(f"# TYPE {METRICS_PREFIX}_{name} {metric_type}")
+
+    def sample(self, name: str, labels: Mapping[str, str], value: float) -> None:
+        self._lines.append(
+            f"{METRICS_PREFIX}_{name}{{{_format_labels(labels)}}} "
+            f"{_format_value(value)}"
+        )
+
+    def histogram(
+        self, name: str, labels: Mapping[str, str], histogram: Histogram
+    ) -> None:
+        bounds = [*map(_format_value, histogram.buckets), "+Inf"]
+        for bound, count in zip(bounds, histogram.cumulative_counts()):
+            self.sample(f"{name}_bucket", {**labels, "le": bound}, count)
+        self.sample(f"{name}_sum", labels, histogram.sum)
+        self.sample(f"{name}_count", labels, histogram.count)
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def render_metrics(metrics_by_entry: Mapping[str, ApiMetrics]) -> str:
+    """Показатели в текстовом формате Prometheus"""
+    writer = _MetricsWriter()
+    entries: Iterable[Tuple[str, ApiMetrics]] = sorted(metrics_by_entry.items())
+
+    def _endpoints():
+        for entry_id, metrics in entries:
+            for endpoint, endpoint_metrics in sorted(metrics.endpoints.items()):
+                yield {"entry": entry_id, "endpoint": endpoint}, endpoint_metrics
+
+    writer.header("requests_total", "counter", "Запросы к ЛК")
+    for labels, endpoint_metrics in _endpoints():
+        writer.sample("requests_total", labels, endpoint_metrics.requests)
+
+    writer.header("request_errors_total", "counter", "Ошибки запросов к ЛК")
+    for labels, endpoint_metrics in _endpoints():
+        for error_name, count in sorted(endpoint_metrics.errors.items()):
+            writer.sample(
+                "request_errors_total", {**labels, "exception": error_name}, count
+            )
+
+    writer.header("request_duration_seconds", "histogram", "Время ответа ЛК, секунды")
+    for labels, endpoint_metrics in _endpoints():
+        writer.histogram("request_duration_seconds", labels, endpoint_metrics.latency)
+
+    writer.header("response_bytes_total", "counter", "Получено байт от ЛК")
+    for labels, endpoint_metrics in _endpoints():
+        writer.sample("response_bytes_total", labels, endpoint_metrics.bytes_received)
+
+    writer.header("logins_total", "counter", "Авторизации в ЛК")
+    for entry_id, metrics in entries:
+        writer.sample("logins_total", {"entry": entry_id}, metrics.logins)
+
+    writer.header(
+        "refresh_duration_seconds", "histogram", "Длительность цикла обновления"
+    )
+    for entry_id, metrics in entries:
+        writer.histogram(
+            "refresh_duration_seconds", {"entry": entry_id}, metrics.refresh
+        )
+
+    writer.header("refresh_failures_total", "counter", "Неудачные циклы обновления")
+    for entry_id, metrics in entries:
+        writer.sample(
+            "refresh_failures_total", {"entry": entry_id}, metrics.refresh_failures
+        )
+
+    return writer.render()
@@ -0,0 +1,53 @@
+__all__ = (
+    "GUKKrasnodarMetricsView",
+    "async_register_metrics",
+)
+
+from typing import Dict, Final
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.http import KEY_HASS
+
+from ._metrics import ApiMetrics, render_metrics
+from .const import DATA_METRICS, DOMAIN
+
+METRICS_URL: Final = f"/api/{DOMAIN}/metrics"
+METRICS_CONTENT_TYPE: Final = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class GUKKrasnodarMetricsView(HomeAssistantView):
+    """Показатели всех конфигурационных записей в текстовом формате Prometheus"""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app[KEY_HASS]
+        return web.Response(
+            body=render_metrics(hass.data.get(DATA_METRICS, {})).encode(),
+            headers={"Content-Type": METRICS_CONTENT_TYPE},
+        )
+
+
+@callback
+def async_register_metrics(
+    hass: HomeAssistant, entry_id: str, metrics: ApiMetrics
+) -> CALLBACK_TYPE:
+    """Опубликовать показатели записи; возвращает функцию отмены публикации"""
+    metrics_by_entry: Dict[str, ApiMetrics] = hass.data.get(DATA_METRICS)
+
+    if metrics_by_entry is None:
+        metrics_by_entry = hass.data[DATA_METRICS] = {}
+        # Представление регистрируется один раз и не может быть удалено
+        if "http" in hass.config.components:
+            hass.http.register_view(GUKKrasnodarMetricsView)
+
+    metrics_by_entry[entry_id] = metrics
+
+    @callback
+    def _async_unregister() -> None:
+        metrics_by_entry.pop(entry_id, None)
+
+    return _async_unregister
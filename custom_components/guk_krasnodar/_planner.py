@@ -0,0 +1,80 @@
+__all__ = (
+    "AccountRequestPlan",
+    "RequestPlan",
+    "build_request_plan",
+)
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, Tuple, Union
+
+from homeassistant.helpers.typing import ConfigType
+
+from .const import CONF_ACCOUNTS, CONF_METER_HISTORY, CONF_METERS
+from .model import Account
+
+
+@dataclass(frozen=True, slots=True)
+class AccountRequestPlan:
+    """Запросы к ЛК, необходимые для объектов одного лицевого счёта"""
+
+    account: Account
+    account_config: ConfigType
+    # Детали лицевого счёта нужны только объекту лицевого счёта
+    detail: bool
+    meters: bool
+    meter_history: bool
+
+    @property
+    def requests_count(self) -> int:
+        # История показаний запрашивается как минимум одним запросом
+        return self.detail + self.meters + self.meter_history
+
+
+@dataclass(frozen=True, slots=True)
+class RequestPlan:
+    """План запросов цикла обновления (без запроса списка лицевых счетов)"""
+
+    accounts: Tuple[AccountRequestPlan, ...]
+    skipped_count: int
+
+    @property
+    def requests_count(self) -> int:
+        return sum(account_plan.requests_count for account_plan in self.accounts)
+
+
+def _plan_account(
+    account: Account, account_config: Union[ConfigType, bool]
+) -> AccountRequestPlan:
+    if account_config is False:
+        return AccountRequestPlan(account, {}, False, False, False)
+
+    meters = account_config[CONF_METERS] is not False
+    return AccountRequestPlan(
+        account,
+        account_config,
+        detail=account_config[CONF_ACCOUNTS] is not False,
+        meters=meters,
+        meter_history=meters and bool(account_config.get(CONF_METER_HISTORY)),
+    )
+
+
+def build_request_plan(
+    accounts: Iterable[Account],
+    get_account_config: Callable[[Account], Union[ConfigType, bool]],
+) -> RequestPlan:
+    """Составить минимальный план запросов по конечной конфигурации.
+
+    Лицевые счета, для которых не создаётся ни одного объекта, в план не
+    попадают и не требуют запросов к ЛК.
+    """
+    planned = []
+    skipped_count = 0
+
+    for account in accounts:
+        account_plan = _plan_account(account, get_account_config(account))
+        if account_plan.requests_count:
+            planned.append(account_plan)
+        else:
+            skipped_count += 1
+
+    return RequestPlan(tuple(planned), skipped_count)
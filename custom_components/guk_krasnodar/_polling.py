@@ -0,0 +1,81 @@
+__all__ = ("AdaptivePollingPolicy",)
+
+from datetime import timedelta
+from typing import Dict, Final, Optional
+
+from ._schema import MIN_SCAN_INTERVAL
+from .model import AccountData
+
+# Во время приёма показаний интервал сокращается в указанное число раз
+SUBMISSION_SPEEDUP: Final = 4
+# Число ускоренных обновлений после передачи показаний
+PUSH_FOLLOWUP_REFRESHES: Final = 3
+# Наибольшее увеличение интервала при неизменных данных
+MAX_BACKOFF_FACTOR: Final = 4
+
+
+def is_submission_open(data: Optional[Dict[str, AccountData]]) -> bool:
+    """Открыт ли приём показаний хотя бы по одному счётчику"""
+    return any(
+        meter.push_allowed and meter.submission_open is not False
+        for account_data in (data or {}).values()
+        for meter in (account_data.meters or {}).values()
+    )
+
+
+class AdaptivePollingPolicy:
+    """Интервал обновления, зависящий от состояния данных.
+
+    - после передачи показаний несколько обновлений выполняются с
+      минимальным интервалом, пока показания не появятся в ЛК;
+    - во время приёма показаний интервал сокращается в `SUBMISSION_SPEEDUP` раз;
+    - пока данные не меняются, интервал удваивается до `MAX_BACKOFF_FACTOR`
+      настроенных интервалов;
+    - интервал не бывает меньше `MIN_SCAN_INTERVAL` (или настроенного
+      интервала, если он меньше).
+    """
+
+    def __init__(self, base_interval: timedelta) -> None:
+        self.base_interval = base_interval
+        self.min_interval = min(MIN_SCAN_INTERVAL, base_interval)
+        self.max_interval = base_interval * MAX_BACKOFF_FACTOR
+        self.interval = base_interval
+        self._static_refreshes = 0
+        self._push_followups = 0
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def notify_push(self) -> timedelta:
+        """Показания переданы: ускорить получение подтверждения"""
+        self._push_followups = PUSH_FOLLOWUP_REFRESHES
+        self._static_refreshes = 0
+        self.interval = self.min_interval
+        return self.interval
+
+    def update(
+        self,
+        previous: Optional[Dict[str, AccountData]],
+        current: Dict[str, AccountData],
+    ) -> timedelta:
+        """Интервал до следующего обновления после получения данных"""
+        changed = previous is None or previous != current
+
+        if changed:
+            self._static_refreshes = 0
+        else:
+            self._static_refreshes += 1
+
+        if self._push_followups:
+            # Переданные показания отразились в ЛК - ускорение не требуется
+            self._push_followups = 0 if changed else self._push_followups - 1
+
+        if self._push_followups:
+            interval = self.min_interval
+        elif is_submission_open(current):
+            interval = self.base_interval / SUBMISSION_SPEEDUP
+        else:
+            interval = self.base_interval * (2 ** min(self._static_refreshes, 16))
+
+        self.interval = self._clamp(interval)
+        return self.interval
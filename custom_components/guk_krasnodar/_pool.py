@@ -0,0 +1,127 @@
+__all__ = (
+    "ConnectionPool",
+    "async_get_connection_pool",
+)
+
+import logging
+from typing import Any, Dict, Final, Optional
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DATA_CONNECTION_POOL
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_LIMIT: Final = 100
+DEFAULT_POOL_LIMIT_PER_HOST: Final = 10
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 60.0
+DEFAULT_DNS_CACHE_TTL: Final = 300
+
+
+class ConnectionPool:
+    """Общий пул HTTP-соединений для всех экземпляров API.
+
+    Соединения с ЛК переиспользуются конфигурационными записями и мастерами
+    настройки, а cookies и заголовки авторизации остаются у сессии каждого
+    экземпляра API.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_POOL_LIMIT,
+        limit_per_host: int = DEFAULT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._connector: Optional[aiohttp.TCPConnector] = None
+
+        self._created_count = 0
+        self._reused_count = 0
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_connection_create_end.append(self._on_connection_create)
+        self._trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+
+    async def _on_connection_create(self, session, context, params) -> None:
+        self._created_count += 1
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self._reused_count += 1
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+        return self._connector
+
+    def get_session_kwargs(self) -> Dict[str, Any]:
+        """Параметры создания сессии, использующей общий пул"""
+        return {
+            "connector": self.connector,
+            "connector_owner": False,
+            "trace_configs": [self._trace_config],
+        }
+
+    @property
+    def created_count(self) -> int:
+        return self._created_count
+
+    @property
+    def reused_count(self) -> int:
+        return self._reused_count
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self._created_count + self._reused_count
+        return self._reused_count / total if total else 0.0
+
+    @property
+    def open_connections(self) -> int:
+        """Число открытых соединений (занятых и ожидающих повторного использования)"""
+        connector = self._connector
+        if connector is None or connector.closed:
+            return 0
+        acquired = getattr(connector, "_acquired", ())
+        idle = getattr(connector, "_conns", {})
+        return len(acquired) + sum(map(len, idle.values()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "open_connections": self.open_connections,
+            "created": self._created_count,
+            "reused": self._reused_count,
+            "reuse_ratio": round(self.reuse_ratio, 3),
+        }
+
+    async def async_close(self) -> None:
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+
+
+@callback
+def async_get_connection_pool(hass: HomeAssistant) -> ConnectionPool:
+    """Общий пул соединений; закрывается при остановке Home Assistant"""
+    pool: Optional[ConnectionPool] = hass.data.get(DATA_CONNECTION_POOL)
+
+    if pool is None:
+        pool = hass.data[DATA_CONNECTION_POOL] = ConnectionPool()
+
+        async def _async_close_pool(event: Event) -> None:
+            _LOGGER.debug(f"Закрытие пула соединений: {pool.get_stats()}")
+            await pool.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_pool)
+
+    return pool
@@ -0,0 +1,146 @@
+__all__ = (
+    "HostRateLimiter",
+    "async_get_host_rate_limiter",
+)
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Final, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DATA_RATE_LIMITERS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT_BURST: Final = 10
+
+
+class HostRateLimiter:
+    """Ограничение частоты (token bucket) и числа одновременных запросов к хосту.
+
+    Ожидающие запросы обслуживаются в порядке поступления, независимо от того,
+    какой конфигурационной записи они принадлежат. Действующие ограничения -
+    самые строгие среди загруженных записей (или заданные при создании, если
+    записей нет) и пересчитываются при добавлении и удалении записей.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE_LIMIT,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        burst: int = DEFAULT_RATE_LIMIT_BURST,
+    ) -> None:
+        self.rate = self.default_rate = rate or None
+        self.max_concurrent = self.default_max_concurrent = max_concurrent
+        self.burst = burst
+        self._entry_limits: Dict[str, Tuple[Optional[float], int]] = {}
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._rate_lock = asyncio.Lock()
+        self._slots = asyncio.Condition()
+        self._active_count = 0
+        self._throttled_count = 0
+        self._throttled_time = 0.0
+
+    @property
+    def active_count(self) -> int:
+        return self._active_count
+
+    @property
+    def throttled_count(self) -> int:
+        """Число запросов, ожидавших освобождения лимита частоты"""
+        return self._throttled_count
+
+    @property
+    def throttled_time(self) -> float:
+        return self._throttled_time
+
+    def _update_limits(self) -> None:
+        if not self._entry_limits:
+            self.rate = self.default_rate
+            self.max_concurrent = self.default_max_concurrent
+            return
+
+        rates = [rate for rate, _ in self._entry_limits.values() if rate is not None]
+        self.rate = min(rates) if rates else None
+        self.max_concurrent = min(
+            max_concurrent for _, max_concurrent in self._entry_limits.values()
+        )
+
+    @callback
+    def async_set_entry_limits(
+        self, entry_id: str, rate: Optional[float], max_concurrent: int
+    ) -> CALLBACK_TYPE:
+        """Задать ограничения записи; возвращает функцию их отмены"""
+        self._entry_limits[entry_id] = (rate or None, max_concurrent)
+        self._update_limits()
+        _LOGGER.debug(
+            f"Ограничение запросов: {self.rate or '-'} в секунду, "
+            f"не более {self.max_concurrent} одновременно"
+        )
+
+        @callback
+        def _async_remove() -> None:
+            self._entry_limits.pop(entry_id, None)
+            self._update_limits()
+
+        return _async_remove
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def _async_acquire_token(self) -> None:
+        if self.rate is None:
+            return
+
+        async with self._rate_lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self._throttled_count += 1
+                self._throttled_time += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
+
+    @asynccontextmanager
+    async def async_limit(self) -> AsyncIterator[None]:
+        """Занять слот одновременного запроса и дождаться лимита частоты"""
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._active_count < self.max_concurrent)
+            self._active_count += 1
+
+        try:
+            await self._async_acquire_token()
+            yield
+        finally:
+            async with self._slots:
+                self._active_count -= 1
+                # Число слотов могло увеличиться после смены ограничений
+                self._slots.notify_all()
+
+
+@callback
+def async_get_host_rate_limiter(hass: HomeAssistant, base_url: str) -> HostRateLimiter:
+    """Общий для всех конфигурационных записей ограничитель запросов к хосту.
+
+    Ограничения записи задаются через `HostRateLimiter.async_set_entry_limits`.
+    """
+    limiters: Dict[str, HostRateLimiter] = hass.data.setdefault(DATA_RATE_LIMITERS, {})
+    limiter = limiters.get(base_url)
+
+    if limiter is None:
+        limiter = limiters[base_url] = HostRateLimiter()
+
+    return limiter
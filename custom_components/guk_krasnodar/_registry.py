@@ -0,0 +1,103 @@
+__all__ = ("EntityRegistry",)
+
+from typing import (
+    Dict,
+    Hashable,
+    Iterator,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+)
+
+if TYPE_CHECKING:
+    from ._base import GUKKrasnodarEntity
+
+
+class EntityRegistry:
+    """Индекс объектов конфигурационной записи.
+
+    Поиск по классу и ключу объекта (код лицевого счёта или пара кодов
+    лицевого счёта и счётчика), по идентификатору объекта и по коду в разделе
+    конфигурации, а также удаление объекта выполняются за O(1).
+
+    Один код может принадлежать нескольким объектам (например, одинаковые
+    коды счётчиков разных лицевых счетов): по коду возвращается первый
+    добавленный из оставшихся объектов.
+    """
+
+    def __init__(self) -> None:
+        self._by_class: Dict[
+            Type["GUKKrasnodarEntity"], Dict[Hashable, "GUKKrasnodarEntity"]
+        ] = {}
+        self._by_entity_id: Dict[str, "GUKKrasnodarEntity"] = {}
+        # (раздел, код) -> {id(объекта): объект} в порядке добавления
+        self._by_code: Dict[Tuple[str, str], Dict[int, "GUKKrasnodarEntity"]] = {}
+        # id(объекта) -> (класс, ключ, идентификатор объекта)
+        self._keys: Dict[int, Tuple[type, Hashable, Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator["GUKKrasnodarEntity"]:
+        for entities in self._by_class.values():
+            yield from entities.values()
+
+    def __getitem__(
+        self, entity_cls: Type["GUKKrasnodarEntity"]
+    ) -> Mapping[Hashable, "GUKKrasnodarEntity"]:
+        return self._by_class.get(entity_cls, {})
+
+    def get(
+        self, entity_cls: Type["GUKKrasnodarEntity"], key: Hashable
+    ) -> Optional["GUKKrasnodarEntity"]:
+        entities = self._by_class.get(entity_cls)
+        return None if entities is None else entities.get(key)
+
+    def get_by_entity_id(self, entity_id: str) -> Optional["GUKKrasnodarEntity"]:
+        return self._by_entity_id.get(entity_id)
+
+    def get_by_code(self, config_key: str, code: str) -> Optional["GUKKrasnodarEntity"]:
+        """Объект по коду в разделе конфигурации (`accounts`, `meters`)"""
+        entities = self._by_code.get((config_key, code))
+        return None if not entities else next(iter(entities.values()))
+
+    def add(self, entity: "GUKKrasnodarEntity", key: Hashable) -> None:
+        entity_cls = type(entity)
+        self._by_class.setdefault(entity_cls, {})[key] = entity
+        self._by_code.setdefault((entity_cls.config_key, entity.code), {})[
+            id(entity)
+        ] = entity
+        self._keys[id(entity)] = (entity_cls, key, None)
+        self.update_entity_id(entity)
+
+    def update_entity_id(self, entity: "GUKKrasnodarEntity") -> None:
+        """Обновить индекс после назначения (изменения) идентификатора объекта"""
+        entity_cls, key, entity_id = self._keys[id(entity)]
+        if entity_id == entity.entity_id:
+            return
+        if entity_id is not None and self._by_entity_id.get(entity_id) is entity:
+            del self._by_entity_id[entity_id]
+        if entity.entity_id is not None:
+            self._by_entity_id[entity.entity_id] = entity
+        self._keys[id(entity)] = (entity_cls, key, entity.entity_id)
+
+    def remove(self, entity: "GUKKrasnodarEntity") -> bool:
+        keys = self._keys.pop(id(entity), None)
+        if keys is None:
+            return False
+
+        entity_cls, key, entity_id = keys
+        entities = self._by_class[entity_cls]
+        if entities.get(key) is entity:
+            del entities[key]
+        if entity_id is not None and self._by_entity_id.get(entity_id) is entity:
+            del self._by_entity_id[entity_id]
+        code_key = (entity_cls.config_key, entity.code)
+        code_entities = self._by_code.get(code_key)
+        if code_entities is not None:
+            code_entities.pop(id(entity), None)
+            if not code_entities:
+                del self._by_code[code_key]
+        return True
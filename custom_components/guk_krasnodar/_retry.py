@@ -0,0 +1,139 @@
+__all__ = (
+    "DEFAULT_RETRY_POLICY_RULES",
+    "RetryBudget",
+    "RetryPolicy",
+    "RetryRule",
+)
+
+import contextlib
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Final, Iterator, Optional, Sequence, Type
+
+from .exceptions import (
+    EmptyResponse,
+    ResponseError,
+    ResponseTimeout,
+    SessionAPIException,
+)
+
+
+@dataclass(frozen=True)
+class RetryRule:
+    """Правило повтора запроса для класса ошибок"""
+
+    exception_cls: Type[SessionAPIException]
+    max_attempts: int = 3
+    predicate: Optional[Callable[[SessionAPIException], bool]] = None
+
+    def matches(self, exc: SessionAPIException) -> bool:
+        if not isinstance(exc, self.exception_cls):
+            return False
+        return self.predicate is None or self.predicate(exc)
+
+
+def _is_server_error(exc: SessionAPIException) -> bool:
+    status = getattr(exc, "status", None)
+    return status is not None and status >= 500
+
+
+DEFAULT_RETRY_POLICY_RULES: Final = (
+    RetryRule(ResponseTimeout, max_attempts=3),
+    RetryRule(EmptyResponse, max_attempts=3),
+    RetryRule(ResponseError, max_attempts=3, predicate=_is_server_error),
+)
+
+
+class RetryBudget:
+    """Число повторов, доступное одной операции (циклу обновления, фоновой задаче)"""
+
+    __slots__ = ("size", "left")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.left = size
+
+    def consume(self) -> bool:
+        if self.left <= 0:
+            return False
+        self.left -= 1
+        return True
+
+
+# Бюджет текущей операции; задачи asyncio наследуют его при создании
+_current_budget: ContextVar[Optional[RetryBudget]] = ContextVar(
+    "guk_krasnodar_retry_budget", default=None
+)
+
+
+class RetryPolicy:
+    """Политика повтора запросов: экспоненциальная задержка со случайным
+    разбросом (full jitter) и ограниченным числом повторов за операцию.
+
+    Бюджет повторов не общий для экземпляра API: каждая операция открывает
+    собственный бюджет через `budget_scope`, поэтому длительная фоновая задача
+    не расходует повторы цикла обновления. Вне бюджета число повторов
+    ограничено только правилами.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[RetryRule] = DEFAULT_RETRY_POLICY_RULES,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        budget: int = 10,
+    ) -> None:
+        self.rules = tuple(rules)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.budget = budget
+        self._retries_count = 0
+
+    @property
+    def retries_count(self) -> int:
+        return self._retries_count
+
+    def create_budget(self) -> RetryBudget:
+        return RetryBudget(self.budget)
+
+    @contextlib.contextmanager
+    def budget_scope(
+        self, budget: Optional[RetryBudget] = None
+    ) -> Iterator[RetryBudget]:
+        """Выполнять запросы внутри блока с отдельным бюджетом повторов"""
+        if budget is None:
+            budget = self.create_budget()
+        token = _current_budget.set(budget)
+        try:
+            yield budget
+        finally:
+            _current_budget.reset(token)
+
+    def get_rule(self, exc: SessionAPIException) -> Optional[RetryRule]:
+        return next((rule for rule in self.rules if rule.matches(exc)), None)
+
+    def get_backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return random.uniform(0, delay)
+
+    def get_retry_delay(
+        self, exc: SessionAPIException, attempt: int
+    ) -> Optional[float]:
+        """Задержка перед повтором после неудачной попытки `attempt` (с нуля).
+
+        Возвращает `None`, если повтор не предусмотрен правилами, число попыток
+        исчерпано или израсходован бюджет повторов.
+        """
+        rule = self.get_rule(exc)
+        if rule is None or attempt + 1 >= rule.max_attempts:
+            return None
+
+        budget = _current_budget.get()
+        if budget is not None and not budget.consume():
+            return None
+
+        self._retries_count += 1
+        return self.get_backoff(attempt)
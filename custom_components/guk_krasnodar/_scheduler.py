@@ -0,0 +1,204 @@
+__all__ = (
+    "RefreshScheduler",
+    "async_get_refresh_scheduler",
+)
+
+import asyncio
+import logging
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Final, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_REFRESH_SCHEDULER, DEFAULT_SCAN_INTERVAL, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Доля интервала (или ширины окна записи), в пределах которой запуск
+# сдвигается случайным образом
+DEFAULT_REFRESH_JITTER: Final = 0.05
+# Окно, в пределах которого распределяются первые обновления записей,
+# восстановленных из снимка данных после перезапуска
+DEFAULT_STARTUP_WINDOW: Final = timedelta(minutes=10)
+
+_EPOCH: Final = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class _ScheduledRefresh:
+    entry_id: str
+    interval: timedelta
+    action: Callable[[], Awaitable[Any]]
+    next_run: Optional[datetime] = None
+    cancel: Optional[CALLBACK_TYPE] = None
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class RefreshScheduler:
+    """Общий планировщик обновления конфигурационных записей.
+
+    Каждой записи назначается смещение фазы внутри окна `DEFAULT_SCAN_INTERVAL`
+    (записи распределяются по окну равномерно в порядке идентификаторов) и
+    случайная добавка в пределах доли интервала. Запуски привязаны к сетке
+    `фаза + k * интервал`, поэтому записи не совпадают и после перезапуска.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: timedelta = timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        jitter: float = DEFAULT_REFRESH_JITTER,
+        startup_window: timedelta = DEFAULT_STARTUP_WINDOW,
+    ) -> None:
+        self.hass = hass
+        self.window = window
+        self.jitter = jitter
+        self.startup_window = startup_window
+        self._entries: Dict[str, _ScheduledRefresh] = {}
+
+    def _get_window(self, interval: timedelta) -> timedelta:
+        return min(self.window, interval)
+
+    def get_phase_offset(self, entry_id: str) -> timedelta:
+        """Смещение запусков записи внутри окна"""
+        scheduled = self._entries[entry_id]
+        entry_ids = sorted(self._entries)
+        return (
+            self._get_window(scheduled.interval)
+            * entry_ids.index(entry_id)
+            / len(entry_ids)
+        )
+
+    def get_startup_delay(self) -> timedelta:
+        """Задержка первого обновления записи с данными из снимка.
+
+        Записи настраиваются одновременно, и их число к моменту настройки
+        каждой записи ещё не известно, поэтому задержка выбирается случайно
+        в пределах окна запуска.
+        """
+        window = min(self.window, self.startup_window).total_seconds()
+        return timedelta(seconds=random.uniform(0, window))
+
+    def get_next_run(self, entry_id: str) -> Optional[datetime]:
+        """Время следующего запланированного обновления записи"""
+        scheduled = self._entries.get(entry_id)
+        return None if scheduled is None else scheduled.next_run
+
+    def get_interval(self, entry_id: str) -> Optional[timedelta]:
+        scheduled = self._entries.get(entry_id)
+        return None if scheduled is None else scheduled.interval
+
+    def _get_next_run(self, scheduled: _ScheduledRefresh, now: datetime) -> datetime:
+        interval = scheduled.interval.total_seconds()
+        phase = self.get_phase_offset(scheduled.entry_id).total_seconds()
+        elapsed = (now - _EPOCH).total_seconds()
+
+        # Ближайшая точка сетки после текущего момента
+        cycle = math.floor((elapsed - phase) / interval) + 1
+        slot_width = self._get_window(scheduled.interval).total_seconds() / len(
+            self._entries
+        )
+        jitter = random.uniform(0, slot_width * self.jitter)
+
+        return _EPOCH + timedelta(seconds=phase + cycle * interval + jitter)
+
+    @callback
+    def _async_schedule(
+        self, scheduled: _ScheduledRefresh, now: Optional[datetime] = None
+    ) -> None:
+        if scheduled.cancel is not None:
+            scheduled.cancel()
+
+        scheduled.next_run = self._get_next_run(scheduled, now or dt_util.utcnow())
+        scheduled.cancel = async_track_point_in_utc_time(
+            self.hass,
+            HassJob(partial(self._async_run_entry, scheduled), cancel_on_shutdown=True),
+            scheduled.next_run,
+        )
+        _LOGGER.debug(
+            f"[{scheduled.entry_id}] Следующее обновление: "
+            f"{dt_util.as_local(scheduled.next_run).isoformat()}"
+        )
+
+    @callback
+    def _async_schedule_all(self) -> None:
+        for scheduled in self._entries.values():
+            self._async_schedule(scheduled)
+
+    @callback
+    def _async_run_entry(self, scheduled: _ScheduledRefresh, now: datetime) -> None:
+        scheduled.cancel = None
+        # Отсчёт от запланированного времени: следующий запуск всегда в
+        # следующем цикле сетки
+        self._async_schedule(scheduled, max(now, scheduled.next_run))
+
+        # Обновление, не завершившееся к следующему запуску, не дублируется
+        if scheduled.running:
+            _LOGGER.debug(
+                f"[{scheduled.entry_id}] Обновление пропущено: предыдущее не завершено"
+            )
+            return
+
+        scheduled.task = self.hass.async_create_background_task(
+            scheduled.action(),
+            f"{DOMAIN} scheduled refresh {scheduled.entry_id}",
+        )
+
+    @callback
+    def async_add(
+        self,
+        entry_id: str,
+        interval: timedelta,
+        action: Callable[[], Awaitable[Any]],
+    ) -> CALLBACK_TYPE:
+        """Запланировать обновление записи; возвращает функцию отмены"""
+        scheduled = self._entries[entry_id] = _ScheduledRefresh(
+            entry_id, interval, action
+        )
+        # Смещения фаз зависят от числа записей
+        self._async_schedule_all()
+
+        @callback
+        def _async_remove() -> None:
+            # После перезагрузки записи место может быть уже занято новым
+            # обновлением той же записи
+            if self._entries.get(entry_id) is not scheduled:
+                return
+            del self._entries[entry_id]
+            if scheduled.cancel is not None:
+                scheduled.cancel()
+            # Выполняемое обновление прерывается вместе с записью
+            if scheduled.running:
+                scheduled.task.cancel()
+            self._async_schedule_all()
+
+        return _async_remove
+
+    @callback
+    def async_set_interval(self, entry_id: str, interval: timedelta) -> None:
+        scheduled = self._entries.get(entry_id)
+        if scheduled is None or scheduled.interval == interval:
+            return
+        scheduled.interval = interval
+        self._async_schedule(scheduled)
+
+
+@callback
+def async_get_refresh_scheduler(hass: HomeAssistant) -> RefreshScheduler:
+    """Общий для всех конфигурационных записей планировщик обновления"""
+    scheduler: Optional[RefreshScheduler] = hass.data.get(DATA_REFRESH_SCHEDULER)
+
+    if scheduler is None:
+        scheduler = hass.data[DATA_REFRESH_SCHEDULER] = RefreshScheduler(hass)
+
+    return scheduler
@@ -13,8 +13,19 @@ from homeassistant.helpers import config_validation as cv
 
 from .const import (
     CONF_ACCOUNTS,
+    CONF_ACCOUNT_TIMEOUT,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METER_HISTORY,
     CONF_METERS,
+    CONF_PARALLEL_ACCOUNTS,
+    CONF_RATE_LIMIT,
     CONF_USER_AGENT,
+    DEFAULT_ACCOUNT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_PARALLEL_ACCOUNTS,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_USER_AGENT,
     CONF_DEV_PRESENTATION,
@@ -56,6 +67,7 @@ GENERIC_ACCOUNT_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_ACCOUNTS, default=True): cv.boolean,
         vol.Optional(CONF_METERS, default=True): cv.boolean,
+        vol.Optional(CONF_METER_HISTORY, default=False): cv.boolean,
         vol.Optional(CONF_DEV_PRESENTATION, default=False): cv.boolean,
         vol.Optional(CONF_NAME_FORMAT, default=lambda: NAME_FORMAT_SCHEMA({})): vol.Any(
             vol.All(cv.string, lambda x: {CONF_ACCOUNTS: x}, NAME_FORMAT_SCHEMA),
@@ -93,6 +105,20 @@ CONFIG_ENTRY_SCHEMA = vol.Schema(
         vol.Required(CONF_PASSWORD): cv.string,
         vol.Optional(CONF_USER_AGENT, default=DEFAULT_USER_AGENT): cv.string,
         vol.Optional(CONF_DEV_PRESENTATION, default=False): cv.boolean,
+        vol.Optional(CONF_CACHE_TTL, default=timedelta(0)): cv.positive_time_period,
+        vol.Optional(CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONF_PARALLEL_ACCOUNTS, default=DEFAULT_PARALLEL_ACCOUNTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONF_ACCOUNT_TIMEOUT, default=timedelta(seconds=DEFAULT_ACCOUNT_TIMEOUT)
+        ): cv.positive_time_period,
+        vol.Optional(CONF_ADAPTIVE_POLLING, default=True): cv.boolean,
         # Additional API configuration
         vol.Optional(
             CONF_DEFAULT, default=lambda: GENERIC_ACCOUNT_SCHEMA({})
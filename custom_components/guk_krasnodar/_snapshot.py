@@ -0,0 +1,139 @@
+__all__ = (
+    "SnapshotStore",
+    "async_remove_snapshot_store",
+)
+
+import datetime
+import logging
+from dataclasses import fields
+from typing import Any, Dict, Final, Mapping, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .guk_krasnodar_api import GUKKrasnodarAPI
+from .model import Account, AccountData, Meter
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 30
+
+_EXCLUDED_FIELDS: Final = frozenset(("api", "account"))
+
+
+def _get_snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+async def async_remove_snapshot_store(hass: HomeAssistant, entry_id: str) -> None:
+    await _get_snapshot_store(hass, entry_id).async_remove()
+
+
+def _date_fields(cls: type) -> frozenset:
+    return frozenset(
+        field.name for field in fields(cls) if field.type.startswith("datetime.date")
+    )
+
+
+_METER_DATE_FIELDS: Final = _date_fields(Meter)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return dict(value)
+    return value
+
+
+def _dump_fields(obj: Any) -> Dict[str, Any]:
+    return {
+        field.name: _dump_value(getattr(obj, field.name))
+        for field in fields(obj)
+        if field.name not in _EXCLUDED_FIELDS
+    }
+
+
+def _load_meter(data: Dict[str, Any], account: Account) -> Meter:
+    data = {
+        name: (
+            datetime.date.fromisoformat(value)
+            if name in _METER_DATE_FIELDS and value is not None
+            else value
+        )
+        for name, value in data.items()
+    }
+    return Meter(**data, account=account)
+
+
+def _dump_account_data(account_data: AccountData) -> Dict[str, Any]:
+    meters = account_data.meters
+    return {
+        "account": _dump_fields(account_data.account),
+        "meters": (
+            None
+            if meters is None
+            else [_dump_fields(meter) for meter in meters.values()]
+        ),
+    }
+
+
+def _load_account_data(data: Dict[str, Any], api: GUKKrasnodarAPI) -> AccountData:
+    account = Account(**data["account"], api=api)
+    meters = data.get("meters")
+    if meters is not None:
+        meters = {
+            meter.code: meter
+            for meter in (_load_meter(meter, account) for meter in meters)
+        }
+    return AccountData(account=account, meters=meters)
+
+
+class SnapshotStore:
+    """Последний успешно полученный снимок данных конфигурационной записи.
+
+    Позволяет создать объекты сразу при запуске, не дожидаясь ответа ЛК.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = _get_snapshot_store(hass, entry_id)
+        self._data: Optional[Dict[str, AccountData]] = None
+
+    def _data_to_save(self) -> dict:
+        data, self._data = self._data, None
+        return {
+            "accounts": [
+                _dump_account_data(account_data)
+                for account_data in (data or {}).values()
+            ]
+        }
+
+    async def async_load(
+        self, api: GUKKrasnodarAPI
+    ) -> Optional[Dict[str, AccountData]]:
+        stored = await self._store.async_load()
+        if not stored or not stored.get("accounts"):
+            return None
+
+        try:
+            accounts_data = [
+                _load_account_data(account_data, api)
+                for account_data in stored["accounts"]
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning(f"Сохранённый снимок данных не подходит: {repr(e)}")
+            return None
+
+        return {
+            account_data.account.code: account_data for account_data in accounts_data
+        }
+
+    def async_schedule_save(self, data: Dict[str, AccountData]) -> None:
+        self._data = data
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        if self._data is not None:
+            await self._store.async_save(self._data_to_save())
@@ -0,0 +1,358 @@
+__all__ = (
+    "MeterStatisticsBackfill",
+    "async_remove_statistics_store",
+    "get_meter_statistic_id",
+    "get_meter_unit",
+)
+
+import asyncio
+import logging
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Final, Iterable, List, Optional
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfVolume
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from ._util import with_auto_auth
+from .const import DOMAIN
+from .exceptions import SessionAPIException
+from .guk_krasnodar_api import GUKKrasnodarAPI
+from .model import Account, AccountData, Meter, MeterHistoryRow
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_STORAGE_VERSION: Final = 1
+STATISTICS_SAVE_DELAY: Final = 10
+DEFAULT_BACKFILL_PERIOD: Final = timedelta(days=5 * 365)
+DEFAULT_BACKFILL_BATCH_SIZE: Final = 100
+DEFAULT_BACKFILL_ROWS_PER_SECOND: Final = 50.0
+
+# ЛК не передаёт единицу измерения: она определяется по названию счётчика
+_METER_UNIT_KEYWORDS: Final = (
+    (("хвс", "гвс", "вод", "газ"), UnitOfVolume.CUBIC_METERS),
+    (("электр", "ээ", "квт"), UnitOfEnergy.KILO_WATT_HOUR),
+    (("тепл", "отоплен", "гкал"), UnitOfEnergy.GIGA_CALORIE),
+)
+
+
+def _get_statistics_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+
+
+async def async_remove_statistics_store(hass: HomeAssistant, entry_id: str) -> None:
+    await _get_statistics_store(hass, entry_id).async_remove()
+
+
+def get_meter_statistic_id(account: Account, meter_code: str) -> str:
+    return f"{DOMAIN}:meter_{account.code}_{meter_code}".lower()
+
+
+def _make_checkpoint_key(account: Account, meter_code: str) -> str:
+    return f"{account.code}:{meter_code}"
+
+
+def get_meter_unit(meter: Meter) -> Optional[str]:
+    """Единица измерения показаний счётчика (`None`, если не определена)"""
+    title = meter.title.lower()
+    for keywords, unit in _METER_UNIT_KEYWORDS:
+        if any(keyword in title for keyword in keywords):
+            return unit
+    return None
+
+
+def _collapse_daily(rows: Iterable[MeterHistoryRow]) -> List[MeterHistoryRow]:
+    """Последняя строка истории за каждый день, в порядке возрастания дат"""
+    daily: Dict[date, MeterHistoryRow] = {}
+    for row in rows:
+        if row.date is not None and row.value is not None:
+            daily[row.date] = row
+    return [daily[day] for day in sorted(daily)]
+
+
+def _merge_account_data(
+    pending: Dict[str, AccountData], data: Dict[str, AccountData]
+) -> Dict[str, AccountData]:
+    """Объединить данные циклов обновления, ожидающие импорта.
+
+    Строки истории счётчиков объединяются в порядке циклов, поэтому строки
+    более раннего цикла не теряются, а при совпадении дат остаются последними
+    строки более позднего.
+    """
+    merged = dict(pending)
+    for key, account_data in data.items():
+        previous = merged.get(key)
+        if previous is None:
+            merged[key] = account_data
+            continue
+
+        meter_history = {
+            code: list(rows) for code, rows in (previous.meter_history or {}).items()
+        }
+        for code, rows in (account_data.meter_history or {}).items():
+            meter_history.setdefault(code, []).extend(rows)
+
+        merged[key] = replace(
+            account_data,
+            meters={**(previous.meters or {}), **(account_data.meters or {})},
+            meter_history=meter_history,
+        )
+    return merged
+
+
+class MeterStatisticsBackfill:
+    """Фоновый импорт истории показаний в долгосрочную статистику.
+
+    Для каждого счётчика история загружается пачками от сохранённой отметки;
+    отметка сохраняется после каждой пачки, поэтому после перезапуска импорт
+    продолжается с места остановки. По завершении первичной загрузки в
+    статистику добавляются только новые строки истории из цикла обновления.
+
+    В статистику записывается одно значение в день (последнее показание).
+    Сумма накапливается из неотрицательных приращений показаний, поэтому
+    замена или сброс счётчика не искажают её. Вместе с отметкой хранятся
+    показание и сумма до дня отметки, что позволяет пересчитать этот день
+    при появлении новых показаний за него.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: GUKKrasnodarAPI,
+        period: timedelta = DEFAULT_BACKFILL_PERIOD,
+        batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE,
+        rows_per_second: float = DEFAULT_BACKFILL_ROWS_PER_SECOND,
+    ) -> None:
+        self.hass = hass
+        self.config_entry = config_entry
+        self.api = api
+        self.period = period
+        self.batch_size = batch_size
+        self.rows_per_second = rows_per_second
+        self._store = _get_statistics_store(hass, config_entry.entry_id)
+        self._checkpoints: Optional[Dict[str, dict]] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._pending_data: Optional[Dict[str, AccountData]] = None
+        self._imported_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def imported_count(self) -> int:
+        return self._imported_count
+
+    async def async_load(self) -> None:
+        if self._checkpoints is None:
+            data = await self._store.async_load() or {}
+            self._checkpoints = dict(data.get("checkpoints") or {})
+
+    def _data_to_save(self) -> dict:
+        self._dirty = False
+        return {"checkpoints": dict(self._checkpoints or {})}
+
+    async def async_save(self) -> None:
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    def _get_checkpoint(self, account: Account, meter_code: str) -> dict:
+        return (self._checkpoints or {}).get(
+            _make_checkpoint_key(account, meter_code)
+        ) or {}
+
+    def get_checkpoint(self, account: Account, meter_code: str) -> Optional[date]:
+        checkpoint_date = self._get_checkpoint(account, meter_code).get("date")
+        return None if checkpoint_date is None else date.fromisoformat(checkpoint_date)
+
+    def is_complete(self, account: Account, meter_code: str) -> bool:
+        checkpoint = (self._checkpoints or {}).get(
+            _make_checkpoint_key(account, meter_code)
+        )
+        return bool(checkpoint and checkpoint.get("complete"))
+
+    def _set_checkpoint(
+        self,
+        account: Account,
+        meter_code: str,
+        checkpoint_date: Optional[date],
+        complete: Optional[bool] = None,
+        **totals: Optional[float],
+    ) -> None:
+        key = _make_checkpoint_key(account, meter_code)
+        checkpoint = self._checkpoints.setdefault(
+            key, {"date": None, "complete": False}
+        )
+        if checkpoint_date is not None and (
+            checkpoint["date"] is None
+            or checkpoint_date >= date.fromisoformat(checkpoint["date"])
+        ):
+            checkpoint["date"] = checkpoint_date.isoformat()
+            checkpoint.update(totals)
+        if complete is not None:
+            checkpoint["complete"] = complete
+
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    @callback
+    def async_schedule(self, data: Dict[str, AccountData]) -> None:
+        """Запустить импорт в фоне; во время выполнения данные ставятся в очередь
+        (данные нескольких циклов объединяются)"""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Импорт статистики пропущен: recorder не загружен")
+            return
+
+        if self.running:
+            if self._pending_data is not None:
+                data = _merge_account_data(self._pending_data, data)
+            self._pending_data = data
+            return
+
+        self._task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_run_pending(data),
+            f"{DOMAIN} statistics backfill {self.config_entry.entry_id}",
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Прервать выполняемый импорт и очистить очередь"""
+        self._pending_data = None
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    async def _async_run_pending(self, data: Dict[str, AccountData]) -> None:
+        while data is not None:
+            await self.async_run(data)
+            data, self._pending_data = self._pending_data, None
+
+    async def async_run(self, data: Dict[str, AccountData]) -> None:
+        # Импорт не расходует бюджет повторов цикла обновления
+        with self.api.retry_policy.budget_scope():
+            await self._async_run(data)
+
+    async def _async_run(self, data: Dict[str, AccountData]) -> None:
+        await self.async_load()
+
+        for account_data in data.values():
+            account = account_data.account
+            for meter in (account_data.meters or {}).values():
+                if self.is_complete(account, meter.code):
+                    rows = (account_data.meter_history or {}).get(meter.code) or []
+                    await self._async_import_rows(account, meter, rows)
+                    continue
+
+                try:
+                    await with_auto_auth(
+                        self.api, self._async_backfill_meter, account, meter
+                    )
+                except SessionAPIException as e:
+                    _LOGGER.warning(
+                        f"Импорт статистики счётчика {meter.code} прерван: {repr(e)}"
+                    )
+
+    async def _async_backfill_meter(self, account: Account, meter: Meter) -> None:
+        checkpoint = self.get_checkpoint(account, meter.code)
+        now = dt_util.utcnow()
+
+        if checkpoint is None:
+            begin = now - self.period
+        else:
+            begin = datetime.combine(checkpoint, time(), timezone.utc)
+
+        _LOGGER.debug(
+            f"Импорт статистики счётчика {meter.code} с {begin.date().isoformat()}"
+        )
+
+        # Пачка импортируется целыми днями: строки дня могут оказаться на
+        # разных страницах истории
+        batch: List[MeterHistoryRow] = []
+        async for row in self.api.async_iter_meter_history(
+            account, [meter], begin, now, page_size=self.batch_size, descending=False
+        ):
+            if len(batch) >= self.batch_size and row.date != batch[-1].date:
+                await self._async_import_rows(account, meter, batch)
+                batch = []
+            batch.append(row)
+
+        await self._async_import_rows(account, meter, batch)
+        self._set_checkpoint(account, meter.code, None, complete=True)
+
+    async def _async_import_rows(
+        self,
+        account: Account,
+        meter: Meter,
+        rows: Iterable[MeterHistoryRow],
+    ) -> None:
+        checkpoint = self._get_checkpoint(account, meter.code)
+        checkpoint_date = self.get_checkpoint(account, meter.code)
+
+        # День отметки пересчитывается от показания и суммы до него
+        rows = [
+            row
+            for row in _collapse_daily(rows)
+            if checkpoint_date is None or row.date >= checkpoint_date
+        ]
+        if not rows:
+            return
+
+        last_date = checkpoint_date
+        state, total = checkpoint.get("state"), checkpoint.get("sum")
+        base_state, base_sum = checkpoint.get("base_state"), checkpoint.get("base_sum")
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{meter.title} ({account.number})",
+            source=DOMAIN,
+            statistic_id=get_meter_statistic_id(account, meter.code),
+            unit_of_measurement=get_meter_unit(meter),
+        )
+
+        for offset in range(0, len(rows), self.batch_size):
+            statistics = []
+            for row in rows[offset : offset + self.batch_size]:
+                if row.date != last_date:
+                    base_state, base_sum = state, total
+                    last_date = row.date
+
+                state = float(row.value)
+                if base_sum is None:
+                    # Первое значение: сумма начинается с нуля, а для отметки
+                    # прежнего формата (без суммы) - с показания, как раньше
+                    total = 0.0 if checkpoint_date is None else state
+                else:
+                    total = base_sum + max(0.0, state - base_state)
+
+                statistics.append(
+                    StatisticData(
+                        start=dt_util.start_of_local_day(row.date),
+                        state=state,
+                        sum=total,
+                    )
+                )
+
+            async_add_external_statistics(self.hass, metadata, statistics)
+
+            self._imported_count += len(statistics)
+            self._set_checkpoint(
+                account,
+                meter.code,
+                last_date,
+                state=state,
+                sum=total,
+                base_state=base_state,
+                base_sum=base_sum,
+            )
+
+            # Ограничение скорости импорта
+            await asyncio.sleep(len(statistics) / self.rows_per_second)
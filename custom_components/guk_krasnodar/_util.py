@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from datetime import date, datetime
 from typing import Any, TypeVar, Callable, Coroutine, TYPE_CHECKING
 
 from homeassistant import config_entries
@@ -9,7 +10,7 @@ from homeassistant.const import CONF_USERNAME
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.helpers.entity_platform import EntityPlatform
 
-from .exceptions import EmptyResponse, AccessDenied, LoginError
+from .exceptions import AccessDenied, TokenExpired
 from .const import DOMAIN
 
 if TYPE_CHECKING:
@@ -63,11 +64,10 @@ async def with_auto_auth(
 ) -> _RT:
     try:
         return await async_getter(*args, **kwargs)
-    except EmptyResponse:
-        # Attempt once more
+    except TokenExpired as e:
+        await api.async_login(expired_token=e.token)
         return await async_getter(*args, **kwargs)
-    # @todo уточнить ошибки протухания токена - вероятно, в отдельный эксепшн
-    except AccessDenied or LoginError:
+    except AccessDenied:
         await api.async_login()
         return await async_getter(*args, **kwargs)
 
@@ -75,12 +75,23 @@ async def with_auto_auth(
 def float_or_none(s: str | None) -> float | None:
     try:
         return float(s)
-    except ValueError:
+    except (TypeError, ValueError):
         return None
 
 
 def int_or_none(s: str | None) -> int | None:
     try:
         return int(s)
-    except ValueError:
+    except (TypeError, ValueError):
+        return None
+
+
+def date_or_none(s: str | None, date_format: str = "%d.%m.%Y") -> date | None:
+    try:
+        if date_format == "%d.%m.%Y":
+            # Быстрый разбор основного формата дат ЛК без strptime
+            day, month, year = s.split(".")
+            return date(int(year), int(month), int(day))
+        return datetime.strptime(s, date_format).date()
+    except (AttributeError, TypeError, ValueError):
         return None
@@ -28,6 +28,8 @@ from homeassistant.const import (
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
+from ._pool import async_get_connection_pool
+from ._util import with_auto_auth
 from .const import (
     CONF_ACCOUNTS,
     CONF_METERS,
@@ -43,7 +45,7 @@ from .guk_krasnodar_api import GUKKrasnodarAPI
 from .exceptions import SessionAPIException
 
 if TYPE_CHECKING:
-    from ._base import GUKKrasnodarEntity
+    from ._registry import EntityRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -108,6 +110,7 @@ class GUKKrasnodarConfigFlow(ConfigFlow, domain=DOMAIN):
         async with GUKKrasnodarAPI(
             username=username,
             password=user_input[CONF_PASSWORD],
+            pool=async_get_connection_pool(self.hass),
         ) as api:
             try:
                 await api.async_login()
@@ -209,22 +212,27 @@ class GUKKrasnodarOptionsFlow(OptionsFlow):
         api: "GUKKrasnodarAPI" = self.hass.data[DATA_API_OBJECTS][
             self.config_entry.entry_id
         ]
-        accounts = await api.async_accounts()
+        # Фоновая авторизация после настройки могла ещё не завершиться, а
+        # токен - истечь
+        if not api.authorized:
+            await api.async_login()
+
+        accounts = await with_auto_auth(api, api.async_accounts)
         account_codes = {
             account.code for account in accounts if account.code is not None
         }
 
         aws = (
-            account.api_meters for account in accounts if isinstance(account, Account)
+            with_auto_auth(api, account.api_meters)
+            for account in accounts
+            if isinstance(account, Account)
         )
 
-        meters_maps: Iterable[Mapping[int, "Meter"]] = await asyncio.gather(*aws)
+        meters_lists: Iterable[Iterable["Meter"]] = await asyncio.gather(*aws)
         meter_codes = set()
 
-        for meters_map in meters_maps:
-            meter_codes.update(
-                [meter.code for meter in meters_map.values() if meter.code is not None]
-            )
+        for meters in meters_lists:
+            meter_codes.update(meter.code for meter in meters if meter.code is not None)
 
         return {
             CONF_ACCOUNTS: sorted(account_codes),
@@ -245,19 +253,18 @@ class GUKKrasnodarOptionsFlow(OptionsFlow):
 
         options = OrderedDict()
 
-        entities: List["GUKKrasnodarEntity"] = (
-            self.hass.data.get(DATA_ENTITIES, {})
-            .get(self.config_entry.entry_id, {})
-            .get(config_key, [])
-        )
+        entities: Optional["EntityRegistry"] = self.hass.data.get(
+            DATA_ENTITIES, {}
+        ).get(self.config_entry.entry_id)
 
         for code in sorted(config_codes.get(config_key, [])):
             text = code
 
-            for entity in entities:
-                if entity.code == code:
-                    text += " (" + entity.entity_id + ")"
-                    break
+            entity = (
+                None if entities is None else entities.get_by_code(config_key, code)
+            )
+            if entity is not None and entity.entity_id:
+                text += " (" + entity.entity_id + ")"
 
             options[code] = text
 
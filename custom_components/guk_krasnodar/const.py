@@ -8,35 +8,60 @@ ATTR_ACCOUNT_NUMBER: Final = "account_number"
 ATTR_ADDRESS: Final = "address"
 ATTR_AREA: Final = "area"
 ATTR_BALANCE: Final = "balance"
+ATTR_CALCULATED_VOLUME: Final = "calculated_volume"
 ATTR_CHARGED: Final = "charged"
+ATTR_CHARGED_PERIOD: Final = "charged_period"
 ATTR_COMMENT: Final = "comment"
 ATTR_DETAIL: Final = "detail"
+ATTR_EXTRA: Final = "extra"
 ATTR_INDICATIONS: Final = "indications"
 ATTR_INDICATION_ENTITY: Final = "indication_entity"
 ATTR_INFO: Final = "info"
 ATTR_LAST_INDICATION: Final = "last_indication"
 ATTR_LAST_INDICATION_DATE: Final = "last_indication_date"
+ATTR_MODEL: Final = "model"
+ATTR_NEXT_VERIFICATION_DATE: Final = "next_verification_date"
+ATTR_PREVIOUS_INDICATION: Final = "previous_indication"
+ATTR_PREVIOUS_INDICATION_DATE: Final = "previous_indication_date"
 ATTR_PUSH_ALLOWED: Final = "push_allowed"
+ATTR_STATUS: Final = "status"
 ATTR_SUCCESS: Final = "success"
 ATTR_TITLE: Final = "title"
 
 DEFAULT_NAME_FORMAT_ACCOUNTS: Final = "{type_ru_cap} {account_number}"
+DEFAULT_ACCOUNT_TIMEOUT: Final = 120
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 4
 DEFAULT_NAME_FORMAT_METERS: Final = "{type_ru_cap} {account_number} {title}"
+DEFAULT_PARALLEL_ACCOUNTS: Final = 4
+DEFAULT_RATE_LIMIT: Final = 5.0
 DEFAULT_SCAN_INTERVAL: Final = 60 * 60 * 6  # 6 hour
 DEFAULT_USER_AGENT: Final = (
     "Mozilla/5.0 (X11; Linux x86_64; rv:135.0) Gecko/20100101 Firefox/135.0"
 )
 
 CONF_ACCOUNTS: Final = "accounts"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_ACCOUNT_TIMEOUT: Final = "account_timeout"
+CONF_CACHE_TTL: Final = "cache_ttl"
 CONF_DEV_PRESENTATION: Final = "dev_presentation"
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
 CONF_METERS: Final = "meters"
+CONF_METER_HISTORY: Final = "meter_history"
 CONF_NAME_FORMAT: Final = "name_format"
+CONF_PARALLEL_ACCOUNTS: Final = "parallel_accounts"
+CONF_RATE_LIMIT: Final = "rate_limit"
 CONF_USER_AGENT: Final = "user_agent"
 
 DATA_API_OBJECTS: Final = DOMAIN + "_api_objects"
+DATA_COORDINATORS: Final = DOMAIN + "_coordinators"
+DATA_CONNECTION_POOL: Final = DOMAIN + "_connection_pool"
 DATA_ENTITIES: Final = DOMAIN + "_entities"
 DATA_FINAL_CONFIG: Final = DOMAIN + "_final_config"
+DATA_METRICS: Final = DOMAIN + "_metrics"
 DATA_PROVIDER_LOGGEROS: Final = DOMAIN + "_provider_LOGGERos"
+DATA_RATE_LIMITERS: Final = DOMAIN + "_rate_limiters"
+DATA_REFRESH_SCHEDULER: Final = DOMAIN + "_refresh_scheduler"
+DATA_REGISTERED_SERVICES: Final = DOMAIN + "_registered_services"
 DATA_UPDATE_DELEGATORS: Final = DOMAIN + "_update_delegators"
 DATA_UPDATE_LISTENERS: Final = DOMAIN + "_update_listeners"
 DATA_YAML_CONFIG: Final = DOMAIN + "_yaml_config"
@@ -8,6 +8,10 @@ class SessionAPIException(HomeAssistantError):
 class ResponseError(SessionAPIException):
     """Ошибка удаленного сервера"""
 
+    def __init__(self, *args, status: int | None = None) -> None:
+        super().__init__(*args)
+        self.status = status
+
 
 class EmptyResponse(SessionAPIException):
     """Ошибка - пустой ответ удаленного сервера"""
@@ -25,6 +29,14 @@ class AccessDenied(SessionAPIException):
     """Ошибка при попытке логина"""
 
 
+class TokenExpired(AccessDenied):
+    """Ошибка - срок действия токена истёк"""
+
+    def __init__(self, *args, token: str | None = None) -> None:
+        super().__init__(*args)
+        self.token = token
+
+
 class NoAuthError(SessionAPIException):
     """Ошибка авторизации"""
 
@@ -1,14 +1,35 @@
 import asyncio
+import contextlib
+import dataclasses
 import json
 import logging
 import re
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from logging import exception
-from typing import Any, Union, SupportsInt, SupportsFloat, Final, Match
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Final,
+    Hashable,
+    Iterable,
+    SupportsFloat,
+    SupportsInt,
+    Union,
+)
 
 import aiohttp
 
-from .model import Account, Meter
-from ._util import float_or_none, int_or_none
+from .model import Account, Meter, MeterHistoryRow
+from ._metrics import ApiMetrics
+from ._pool import ConnectionPool
+from ._rate_limit import HostRateLimiter
+from ._retry import RetryPolicy
+from ._util import date_or_none, float_or_none, int_or_none
 from .exceptions import (
     ResponseError,
     LoginError,
@@ -17,27 +38,47 @@ from .exceptions import (
     SessionAPIException,
     AccessDenied,
     InvalidValue,
+    TokenExpired,
 )
 
 _LOGGER = logging.getLogger(__name__)
 LOG_TRACE_HTTP = False
 
 DEFAULT_TIMEOUT: Final = aiohttp.ClientTimeout(total=30)
-
-FIELD_CURRENT_METRIC_INDICATION: Final = re.compile(
-    r"Текущие показания: .*?(\d+).*? от .*?([\d.]+\d).*?"
-)
-FIELD_LAST_METRIC_INDICATION: Final = re.compile(
-    r"Предыдущие показания: .*?(\d+).*? от .*?([\d.]+\d).*?"
-)
+DEFAULT_CACHE_SIZE: Final = 256
+DEFAULT_HISTORY_PAGE_SIZE: Final = 50
+# Даты строк `info` счётчиков: дни передачи показаний (одни и те же для
+# счётчиков лицевого счёта и в пределах окна приёма показаний) и даты поверки
+# на ближайшие годы. Их число ограничено календарём (около 4000 дней за 11
+# лет), а не числом счётчиков
+METER_INFO_DATE_CACHE_SIZE: Final = 4096
+DEFAULT_TOKEN_LIFETIME: Final = timedelta(hours=12)
+TOKEN_REFRESH_MARGIN: Final = 0.1
+
+CACHE_KEY_ACCOUNTS: Final = "accounts"
+CACHE_KEY_ACCOUNT_DETAIL: Final = "account_detail"
+CACHE_KEY_METERS: Final = "meters"
 
 FIELD_NAME_ACCOUNT_CHARGED: Final = re.compile(
     r"Начисление за (.+) \(основные услуги\)"
 )
-FIELD_NAME_ACCOUNT_DEBT: Final = re.compile(r"Задолженность \(основные услуги\)")
-FIELD_NAME_ACCOUNT_CRED: Final = re.compile(r"Переплата \(основные услуги\)")
 
-FIELD_NAME_AREA: Final = re.compile(r"Оплачиваемая площадь")
+ACCOUNT_DETAIL_CACHE_SIZE: Final = 256
+
+# Строки деталей лицевого счёта: название -> (поле `Account`, преобразование)
+ACCOUNT_DETAIL_FIELDS: Final[dict[str, tuple[str, Callable[[Any], Any]]]] = {
+    "Задолженность (основные услуги)": ("balance", float_or_none),
+    "Переплата (основные услуги)": ("balance", float_or_none),
+    "Оплачиваемая площадь": ("area", float_or_none),
+}
+
+# Правила для названий с параметрами: (шаблон, поле `Account`, преобразование,
+# поля `Account` для групп шаблона)
+ACCOUNT_DETAIL_PATTERNS: Final[
+    tuple[tuple[re.Pattern, str, Callable[[Any], Any], tuple[str, ...]], ...]
+] = (
+    (FIELD_NAME_ACCOUNT_CHARGED, "charged", float_or_none, ("charged_period",)),
+)
 
 API_URL: Final = "https://lk.gukkrasnodar.ru"
 
@@ -46,27 +87,156 @@ def _aiohttp_create_session(*args, **kwargs):
     return aiohttp.ClientSession(*args, **kwargs)
 
 
-def _parse_last_indication(
-    value: str | list | None,
-) -> tuple[int | None, str | None]:
-    if value:
-        if isinstance(value, str):
-            value = [value]
+def _format_history_datetime(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="milliseconds") + "Z"
 
-        curr_match: Match[str] | None = next(
-            filter(None, (FIELD_CURRENT_METRIC_INDICATION.match(s) for s in value)),
-            None,
-        )
-        if curr_match:
-            return int_or_none(curr_match.group(1)), curr_match.group(2)
 
-        last_match: Match[str] | None = next(
-            filter(None, (FIELD_LAST_METRIC_INDICATION.match(s) for s in value)), None
-        )
-        if last_match:
-            return int_or_none(last_match.group(1)), last_match.group(2)
+_INFO_DATE: Final = r"(\d\d?+\.\d\d?+\.\d{4})"
+
+# Строки `info` счётчика в порядке, в котором их возвращает ЛК. Группы
+# нумеруются одинаково в обоих выражениях ниже:
+# 1 - дата поверки, 2 - модель, 3 - состояние, 4/5 - предыдущие показания и
+# дата, 6/7 - текущие показания и дата, 8 - расчетный объем.
+# Квантификаторы без возврата (`*+`) сокращают перебор при сопоставлении
+_METER_INFO_LINES: Final = (
+    rf"Дата следующей поверки: *+{_INFO_DATE}",
+    r"Модель: *+(.*)",
+    r"Состояние: *+(.*)",
+    rf"Предыдущие показания:[^\d\n]*+(\d++)[^\d\n]* от *+{_INFO_DATE}",
+    rf"Текущие показания:[^\d\n]*+(\d++)[^\d\n]* от *+{_INFO_DATE}",
+    r"Расчетный объем: *+(\d++(?:\.\d+)?)",
+)
 
-    return None, None
+# Все строки `info` в обычном порядке (любая строка может отсутствовать)
+# разбираются одним сопоставлением
+METER_INFO_LAYOUT: Final = re.compile(
+    "".join(rf"(?:[ \t]*+{line}.*+\n?)?+" for line in _METER_INFO_LINES) + r"\Z"
+)
+# Разбор по строкам - для строк в другом порядке и неизвестных строк
+METER_INFO_LINE: Final = re.compile(r"[ \t]*+(?:" + "|".join(_METER_INFO_LINES) + ")")
+
+METER_INFO_NO_DATA: Final = "Информация отсутствует"
+
+
+@lru_cache(maxsize=METER_INFO_DATE_CACHE_SIZE)
+def _parse_info_date(value: str) -> date | None:
+    return date_or_none(value)
+
+
+def _parse_info_text(value: str) -> str | None:
+    value = value.strip()
+    return None if not value or value == METER_INFO_NO_DATA else value
+
+
+@lru_cache(maxsize=ACCOUNT_DETAIL_CACHE_SIZE)
+def _get_account_detail_rule(
+    name: str,
+) -> tuple[str, Callable[[Any], Any], tuple[tuple[str, Any], ...]] | None:
+    """Правило разбора строки деталей по названию: (поле, преобразование,
+    значения полей из названия). Результат кэшируется по названию строки.
+    """
+    rule = ACCOUNT_DETAIL_FIELDS.get(name)
+    if rule is not None:
+        return rule[0], rule[1], ()
+
+    for pattern, field_name, parse, group_fields in ACCOUNT_DETAIL_PATTERNS:
+        match = pattern.match(name)
+        if match is not None:
+            return field_name, parse, tuple(zip(group_fields, match.groups()))
+
+    return None
+
+
+def _decode_account_detail(rows: Iterable[dict]) -> dict[str, Any]:
+    """Разбор строк деталей лицевого счёта в поля `Account`.
+
+    Строки без правила разбора сохраняются в поле `extra`.
+    """
+    fields: dict[str, Any] = {}
+    extra: dict[str, Any] = {}
+
+    for row in rows:
+        name = row.get("name")
+        if not name:
+            continue
+
+        rule = _get_account_detail_rule(name)
+        if rule is None:
+            extra[name] = row.get("value")
+            continue
+
+        field_name, parse, name_fields = rule
+        fields[field_name] = parse(row.get("value"))
+        fields.update(name_fields)
+
+    fields["extra"] = extra
+    return fields
+
+
+def _match_meter_info_lines(lines: list[str]) -> tuple[str | None, ...]:
+    values: list[str | None] = [None] * METER_INFO_LINE.groups
+    for line in lines:
+        match = METER_INFO_LINE.match(line)
+        if match is not None:
+            for index, value in enumerate(match.groups()):
+                if value is not None:
+                    values[index] = value
+    return tuple(values)
+
+
+def _parse_meter_info(value: str | list | None) -> dict[str, Any]:
+    """Разбор строк `info` счётчика в поля `Meter`.
+
+    Обычно все строки разбираются одним сопоставлением регулярного выражения.
+    Строки каждого счётчика уникальны (содержат показания), поэтому
+    кэшируется только разбор дат.
+    """
+    if isinstance(value, str):
+        value = [value]
+
+    fields: dict[str, Any] = {}
+    if not value:
+        fields["last_indication"] = fields["last_indication_date"] = None
+        return fields
+
+    match = METER_INFO_LAYOUT.match("\n".join(value))
+    (
+        verification_date,
+        model,
+        status,
+        previous_indication,
+        previous_indication_date,
+        last_indication,
+        last_indication_date,
+        calculated_volume,
+    ) = (
+        match.groups() if match is not None else _match_meter_info_lines(value)
+    )
+
+    if verification_date is not None:
+        fields["next_verification_date"] = _parse_info_date(verification_date)
+    if model is not None:
+        fields["model"] = _parse_info_text(model)
+    if status is not None:
+        fields["status"] = _parse_info_text(status)
+    if previous_indication is not None:
+        fields["previous_indication"] = int(previous_indication)
+        fields["previous_indication_date"] = _parse_info_date(previous_indication_date)
+
+    # При отсутствии текущих показаний последними считаются предыдущие
+    if last_indication is not None:
+        fields["last_indication"] = int(last_indication)
+        fields["last_indication_date"] = _parse_info_date(last_indication_date)
+    else:
+        fields["last_indication"] = fields.get("previous_indication")
+        fields["last_indication_date"] = fields.get("previous_indication_date")
+
+    if calculated_volume is not None:
+        fields["calculated_volume"] = float(calculated_volume)
+
+    return fields
 
 
 class GUKKrasnodarAPI:
@@ -81,6 +251,14 @@ class GUKKrasnodarAPI:
         ] = DEFAULT_TIMEOUT,
         user_agent: str = None,
         base_url: str = None,
+        cache_ttl: Union[SupportsFloat, timedelta, None] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        token_lifetime: timedelta | None = DEFAULT_TOKEN_LIFETIME,
+        retry_policy: RetryPolicy | None = None,
+        pool: ConnectionPool | None = None,
+        session: aiohttp.ClientSession | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        metrics: ApiMetrics | None = None,
     ):
         self._username = username
         self._password = password
@@ -96,24 +274,69 @@ class GUKKrasnodarAPI:
             else:
                 raise TypeError("invalid argument type for timeout provided")
 
-        self._session = _aiohttp_create_session(
-            timeout=timeout,
-            cookie_jar=aiohttp.CookieJar(),
-            headers={aiohttp.hdrs.USER_AGENT: self._user_agent},
-        )
+        self._client_timeout = timeout
+
+        # Сессия создаётся поверх общего пула соединений (если задан), при этом
+        # cookies и заголовки авторизации остаются у каждого экземпляра API
+        self._pool = pool
+        self._session_owner = session is None
+        if session is None:
+            session = _aiohttp_create_session(
+                timeout=timeout,
+                cookie_jar=aiohttp.CookieJar(),
+                **(pool.get_session_kwargs() if pool is not None else {}),
+            )
+        self._session = session
         self._token = None
 
+        # Жизненный цикл токена: повторная авторизация выполняется под блокировкой
+        self._token_lifetime = token_lifetime
+        self._token_issued_at: float | None = None
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
+        self._logins_count = 0
+
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics or ApiMetrics()
+
+        # Single-flight: одинаковые одновременные запросы используют общий ответ
+        self._inflight_requests: dict[tuple, asyncio.Task] = {}
+        self._requests_count = 0
+        self._coalesced_requests_count = 0
+
+        # Кэш ответов на запросы чтения (отключён, если не задано время жизни)
+        if isinstance(cache_ttl, timedelta):
+            cache_ttl = cache_ttl.total_seconds()
+        self._cache_ttl: float | None = float(cache_ttl) if cache_ttl else None
+        self._cache_size = cache_size
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, *args):
-        await self._session.__aexit__(*args)
         await self.async_close()
 
     async def async_close(self):
-        if not self._session.closed:
+        self._cache.clear()
+        if self._session_owner and not self._session.closed:
             await self._session.close()
 
+    @property
+    def pool(self) -> ConnectionPool | None:
+        return self._pool
+
+    @property
+    def rate_limiter(self) -> HostRateLimiter | None:
+        return self._rate_limiter
+
+    @property
+    def metrics(self) -> ApiMetrics:
+        return self._metrics
+
     @property
     def username(self):
         return self._username
@@ -134,20 +357,227 @@ class GUKKrasnodarAPI:
     def base_url(self) -> str:
         return self._base_url
 
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    @property
+    def requests_count(self) -> int:
+        """Количество запросов к API, включая объединённые"""
+        return self._requests_count
+
+    @property
+    def coalesced_requests_count(self) -> int:
+        """Количество запросов, присоединённых к уже выполняемому запросу"""
+        return self._coalesced_requests_count
+
+    @property
+    def authorized(self) -> bool:
+        return self._token is not None
+
+    @property
+    def logins_count(self) -> int:
+        """Количество выполненных запросов авторизации"""
+        return self._logins_count
+
+    @property
+    def token_age(self) -> float | None:
+        """Время (в секундах) с момента получения токена"""
+        if self._token is None or self._token_issued_at is None:
+            return None
+        return time.monotonic() - self._token_issued_at
+
+    @property
+    def token_stale(self) -> bool:
+        """Токен скоро истечёт и должен быть обновлён заранее"""
+        token_age = self.token_age
+        if token_age is None or self._token_lifetime is None:
+            return False
+        return token_age >= self._token_lifetime.total_seconds() * (
+            1 - TOKEN_REFRESH_MARGIN
+        )
+
+    @property
+    def cache_hits(self) -> int:
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self._cache_misses
+
+    def invalidate_cache(
+        self, cache_key: str | None = None, account: Account | None = None
+    ) -> None:
+        """Сбросить кэш ответов: целиком, по типу запроса или по лицевому счёту"""
+        if cache_key is None and account is None:
+            self._cache.clear()
+            return
+
+        for key in list(self._cache):
+            endpoint, company_id, account_id = key
+            if cache_key is not None and endpoint != cache_key:
+                continue
+            if account is not None and (company_id, account_id) != (
+                account.company_id,
+                account.id,
+            ):
+                continue
+            del self._cache[key]
+
+    async def _async_cached(
+        self,
+        cache_key: tuple[str, Any, Any],
+        async_request: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        if self._cache_ttl is None:
+            return await async_request()
+
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            expires_at, response = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                return response
+            del self._cache[cache_key]
+
+        self._cache_misses += 1
+        response = await async_request()
+
+        self._cache[cache_key] = (time.monotonic() + self._cache_ttl, response)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return response
+
     async def __async_request(
         self,
         url: str,
         referer: str = base_url,
         data: dict = None,
         method: str = "GET",
+        auth: bool = True,
+        idempotent: bool = True,
+    ) -> Any:
+        self._requests_count += 1
+
+        if auth:
+            if self.token_stale:
+                _LOGGER.debug("Заблаговременное обновление токена")
+                await self.async_login()
+            elif self._login_lock.locked():
+                # Дождаться выполняемой авторизации, чтобы не отправить старый токен
+                async with self._login_lock:
+                    pass
+
+        token = self._token if auth else None
+        request_key = (
+            method,
+            url,
+            json.dumps(data, sort_keys=True, default=str),
+            token,
+        )
+
+        task = self._inflight_requests.get(request_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.__async_perform_request_with_retry(
+                    url=url,
+                    referer=referer,
+                    data=data,
+                    method=method,
+                    token=token,
+                    idempotent=idempotent,
+                )
+            )
+            self._inflight_requests[request_key] = task
+
+            def _forget_request(done_task: asyncio.Task) -> None:
+                self._inflight_requests.pop(request_key, None)
+                if not done_task.cancelled():
+                    # Ошибка может быть не получена, если все ожидающие отменены
+                    done_task.exception()
+
+            task.add_done_callback(_forget_request)
+        else:
+            self._coalesced_requests_count += 1
+            if LOG_TRACE_HTTP:
+                _LOGGER.debug(f"Request [{method}] {url} coalesced")
+
+        return await asyncio.shield(task)
+
+    async def __async_perform_request_with_retry(
+        self,
+        url: str,
+        referer: str = base_url,
+        data: dict = None,
+        method: str = "GET",
+        token: str | None = None,
+        idempotent: bool = True,
+    ) -> Any:
+        attempt = 0
+        while True:
+            # Каждая попытка проходит через общий для хоста ограничитель запросов
+            limit = (
+                contextlib.nullcontext()
+                if self._rate_limiter is None
+                else self._rate_limiter.async_limit()
+            )
+            try:
+                async with limit:
+                    return await self.__async_perform_measured_request(
+                        url=url, referer=referer, data=data, method=method, token=token
+                    )
+            except SessionAPIException as e:
+                # Неидемпотентные запросы (передача показаний) не повторяются
+                delay = (
+                    self._retry_policy.get_retry_delay(e, attempt)
+                    if idempotent
+                    else None
+                )
+                if delay is None:
+                    raise
+
+                attempt += 1
+                _LOGGER.debug(
+                    f"Повтор запроса [{method}] {url} через {delay:.2f} с "
+                    f"(попытка {attempt + 1}): {repr(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    def _get_endpoint(self, url: str) -> str:
+        """Точка API для показателей: путь запроса без адреса ЛК"""
+        return url[len(self.base_url) :] if url.startswith(self.base_url) else url
+
+    async def __async_perform_measured_request(self, url: str, **kwargs) -> Any:
+        endpoint = self._get_endpoint(url)
+        error = None
+        started_at = time.monotonic()
+        try:
+            return await self.__async_perform_request(url=url, **kwargs)
+        except SessionAPIException as e:
+            error = e
+            raise
+        finally:
+            self._metrics.record_request(endpoint, time.monotonic() - started_at, error)
+
+    async def __async_perform_request(
+        self,
+        url: str,
+        referer: str = base_url,
+        data: dict = None,
+        method: str = "GET",
+        token: str | None = None,
     ) -> Any:
         headers = {
+            aiohttp.hdrs.USER_AGENT: self._user_agent,
             aiohttp.hdrs.ORIGIN: self.base_url,
             aiohttp.hdrs.REFERER: referer or self.base_url,
             aiohttp.hdrs.CONTENT_TYPE: "application/json",
         }
-        if self._token is not None:
-            headers[aiohttp.hdrs.AUTHORIZATION] = "Bearer " + self._token
+        if token is not None:
+            headers[aiohttp.hdrs.AUTHORIZATION] = "Bearer " + token
 
         try:
             if LOG_TRACE_HTTP:
@@ -155,13 +585,24 @@ class GUKKrasnodarAPI:
 
             if method == "POST":
                 async with self._session.post(
-                    url, headers=headers, data=json.dumps(data)
+                    url,
+                    headers=headers,
+                    data=json.dumps(data),
+                    timeout=self._client_timeout,
                 ) as response:
                     response_status = response.status
+                    self._metrics.record_bytes(
+                        self._get_endpoint(url), len(await response.read())
+                    )
                     response = await response.json()
             elif method == "GET":
-                async with self._session.get(url, headers=headers) as response:
+                async with self._session.get(
+                    url, headers=headers, timeout=self._client_timeout
+                ) as response:
                     response_status = response.status
+                    self._metrics.record_bytes(
+                        self._get_endpoint(url), len(await response.read())
+                    )
                     response = await response.json()
             else:
                 raise NotImplementedError
@@ -174,6 +615,12 @@ class GUKKrasnodarAPI:
 
             if response_status == 200 and response.get("success", False) is True:
                 return response
+            elif response_status == 401 and token is not None:
+                _LOGGER.info(f"Срок действия токена истёк [{response_status}]")
+                raise TokenExpired(
+                    f"Срок действия токена истёк: [{response_status}] {response.get('code', None)}: {response.get('message', None)}",
+                    token=token,
+                )
             elif response_status == 400 or response_status == 401:
                 _LOGGER.warning(f"Ошибка доступа [{response_status}] {response}")
                 raise AccessDenied(
@@ -182,34 +629,51 @@ class GUKKrasnodarAPI:
             else:
                 _LOGGER.debug(f"Ошибка сервера: [{response_status}] {response}")
                 raise ResponseError(
-                    f"Ошибка сервера: [{response_status}] {response.get('code', None)}: {response.get('message', None)}"
+                    f"Ошибка сервера: [{response_status}] {response.get('code', None)}: {response.get('message', None)}",
+                    status=response_status,
                 )
 
+        except aiohttp.ClientResponseError as e:
+            raise ResponseError(f"Общая ошибка запроса: {repr(e)}", status=e.status)
+
         except aiohttp.ClientError as e:
             raise ResponseError(f"Общая ошибка запроса: {repr(e)}")
 
         except asyncio.TimeoutError:
             raise ResponseTimeout("Ошибка ожидания ответа от сервера")
 
-    async def _async_get(self, url, referer=None):
-        return await self.__async_request(url=url, referer=referer, method="GET")
+    async def _async_get(self, url, referer=None, auth=True):
+        return await self.__async_request(
+            url=url, referer=referer, method="GET", auth=auth
+        )
 
-    async def _async_post(self, url, referer=None, data=None):
+    async def _async_post(
+        self, url, referer=None, data=None, auth=True, idempotent=True
+    ):
         return await self.__async_request(
-            url=url, referer=referer, data=data, method="POST"
+            url=url,
+            referer=referer,
+            data=data,
+            method="POST",
+            auth=auth,
+            idempotent=idempotent,
         )
 
     async def _async_login(self, login, password):
         self._token = None
+        self._token_issued_at = None
         data = {
             "login": login,
             "password": password,
         }
+        self._logins_count += 1
+        self._metrics.record_login()
         try:
             response = await self._async_post(
                 f"{self.base_url}/api/v1/user/login",
                 referer=f"{self.base_url}/login",
                 data=data,
+                auth=False,
             )
         except ResponseError as e:
             raise LoginError(f"Ошибка авторизации {repr(e)}") from e
@@ -218,16 +682,36 @@ class GUKKrasnodarAPI:
         if token is not None and token:
             _LOGGER.debug("Успешная авторизация")
             self._token = token
+            self._token_issued_at = time.monotonic()
         else:
             raise LoginError("Ошибка авторизации: нет токена")
 
-    async def async_login(self):
-        await self._async_login(self._username, self._password)
+    async def async_login(self, expired_token: str | None = None):
+        """Авторизация в ЛК.
+
+        Одновременные вызовы ожидают одну авторизацию и используют её результат.
+        Если передан `expired_token`, авторизация пропускается, когда токен
+        уже был обновлён другим вызовом.
+        """
+        login_generation = self._login_generation
+        async with self._login_lock:
+            if self._token is not None and (
+                login_generation != self._login_generation
+                or (expired_token is not None and expired_token != self._token)
+            ):
+                _LOGGER.debug("Токен уже обновлён")
+                return
+
+            await self._async_login(self._username, self._password)
+            self._login_generation += 1
 
     async def async_accounts(self) -> list[Account]:
-        response = await self._async_get(
-            f"{self.base_url}/api/v1/user/accounts",
-            referer=f"{self.base_url}/cabinet/accounts",
+        response = await self._async_cached(
+            (CACHE_KEY_ACCOUNTS, None, None),
+            lambda: self._async_get(
+                f"{self.base_url}/api/v1/user/accounts",
+                referer=f"{self.base_url}/cabinet/accounts",
+            ),
         )
 
         response = response.get("accounts", [])
@@ -247,12 +731,15 @@ class GUKKrasnodarAPI:
             _LOGGER.debug(_accounts)
         return _accounts
 
-    async def async_update_account_detail(self, account: Account) -> [Account]:
+    async def async_update_account_detail(self, account: Account) -> Account:
         data = {"id_company": account.company_id, "id_account": account.id}
-        response = await self._async_post(
-            f"{self.base_url}/api/v1/user/account/info/extend",
-            referer=f"{self.base_url}/cabinet/accounts",
-            data=data,
+        response = await self._async_cached(
+            (CACHE_KEY_ACCOUNT_DETAIL, account.company_id, account.id),
+            lambda: self._async_post(
+                f"{self.base_url}/api/v1/user/account/info/extend",
+                referer=f"{self.base_url}/cabinet/accounts",
+                data=data,
+            ),
         )
 
         response = response.get("info", [])
@@ -260,15 +747,8 @@ class GUKKrasnodarAPI:
             f"Детали по счету {account.company_id} {account.id} получены ({len(response)})"
         )
 
-        for detail in response:
-            if FIELD_NAME_ACCOUNT_DEBT.match(detail["name"]):
-                account.balance = float_or_none(detail["value"])
-            elif FIELD_NAME_ACCOUNT_CRED.match(detail["name"]):
-                account.balance = float_or_none(detail["value"])
-            elif FIELD_NAME_ACCOUNT_CHARGED.match(detail["name"]):
-                account.charged = float_or_none(detail["value"])
-            elif FIELD_NAME_AREA.match(detail["name"]):
-                account.area = float_or_none(detail["value"])
+        # Переданный объект не изменяется: возвращается новый снимок лицевого счёта
+        account = dataclasses.replace(account, **_decode_account_detail(response))
 
         if LOG_TRACE_HTTP:
             _LOGGER.debug(account)
@@ -276,13 +756,17 @@ class GUKKrasnodarAPI:
 
     async def async_meters(self, account: Account) -> [Meter]:
         data = {"id_company": account.company_id, "id_account": account.id}
-        response = await self._async_post(
-            f"{self.base_url}/api/v1/user/account/meters",
-            referer=f"{self.base_url}/cabinet/accounts/{account.company_id}/{account.id}/meters",
-            data=data,
+        response = await self._async_cached(
+            (CACHE_KEY_METERS, account.company_id, account.id),
+            lambda: self._async_post(
+                f"{self.base_url}/api/v1/user/account/meters",
+                referer=f"{self.base_url}/cabinet/accounts/{account.company_id}/{account.id}/meters",
+                data=data,
+            ),
         )
 
         push_allowed = response.get("volume_allow", False)
+        submission_open = (response.get("accept_measure_set") or {}).get("accept")
         response = response.get("meter", [])
         _LOGGER.debug(f"Список счётчиков получен ({len(response)})")
         _meters = [
@@ -292,10 +776,9 @@ class GUKKrasnodarAPI:
                 account=account,
                 detail=meter["detail"],
                 info=meter["info"],
-                # last_indication=int(meter["curr_measure"]),
-                last_indication=_parse_last_indication(meter["info"])[0],
-                last_indication_date=_parse_last_indication(meter["info"])[1],
                 push_allowed=push_allowed,
+                submission_open=submission_open,
+                **_parse_meter_info(meter["info"]),
             )
             for meter in response
         ]
@@ -303,6 +786,71 @@ class GUKKrasnodarAPI:
             _LOGGER.debug(_meters)
         return _meters
 
+    async def async_iter_meter_history(
+        self,
+        account: Account,
+        meters: Iterable[Meter],
+        begin: datetime,
+        end: datetime,
+        page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+        descending: bool = True,
+    ) -> AsyncIterator[MeterHistoryRow]:
+        """История показаний счётчиков лицевого счёта за период.
+
+        Строки запрашиваются постранично по `page_size` и отдаются по мере
+        получения, поэтому в памяти одновременно находится не более одной
+        страницы.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        meter_ids = [meter.id for meter in meters]
+        if not meter_ids:
+            return
+
+        offset = 0
+        while True:
+            data = {
+                "id_account": account.id,
+                "id_company": account.company_id,
+                "offset": offset,
+                "limit": page_size,
+                "id_meters": meter_ids,
+                "begin_date": _format_history_datetime(begin),
+                "end_date": _format_history_datetime(end),
+                "platform_type": "desktop",
+                "sort_by": None,
+                "descending": descending,
+            }
+            response = await self._async_post(
+                f"{self.base_url}/api/v1/user/account/meter/measure/history",
+                referer=f"{self.base_url}/cabinet/accounts/{account.company_id}/{account.id}/meters",
+                data=data,
+            )
+
+            history = response.get("meter_measure_history") or {}
+            rows = history.get("meter_measure") or []
+            total = int_or_none(history.get("count_meter_measure"))
+
+            _LOGGER.debug(
+                f"История показаний по счету {account.company_id} {account.id} "
+                f"получена (смещение {offset}, строк {len(rows)})"
+            )
+
+            for row in rows:
+                yield MeterHistoryRow(
+                    meter_id=str(row["id_meter"]),
+                    date=date_or_none(row.get("date")),
+                    value=int_or_none(row.get("value")),
+                    volume=float_or_none(row.get("volume")),
+                    period_name=row.get("period_name"),
+                    info=row.get("info"),
+                )
+
+            offset += len(rows)
+            if len(rows) < page_size or (total is not None and offset >= total):
+                break
+
     async def async_send_measure(self, meter: Meter, value: int | None):
         _value = int_or_none(value)
         if _value > 0:
@@ -318,9 +866,16 @@ class GUKKrasnodarAPI:
                     f"{self.base_url}/api/v1/user/account/meter/measure/set",
                     referer=f"{self.base_url}/cabinet/accounts/{meter.account.company_id}/{meter.account.id}/meters",
                     data=data,
+                    idempotent=False,
                 )
+            except (AccessDenied, LoginError):
+                # Ошибки авторизации передаются без изменений для повторной
+                # авторизации (`with_auto_auth`)
+                raise
             except SessionAPIException as e:
-                raise ResponseError(f"Ошибка передачи показаний {str(e)}")
+                raise ResponseError(f"Ошибка передачи показаний {str(e)}") from e
+
+            self.invalidate_cache(CACHE_KEY_METERS, meter.account)
 
             _LOGGER.info(f"Показания переданы. {meter.code}: {_value}")
         else:
@@ -1,12 +1,31 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+import datetime
+import sys
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .guk_krasnodar_api import GUKKrasnodarAPI
 
 
-@dataclass
+def _intern_fields(obj: Any, field_names: Iterable[str]) -> None:
+    """Интернировать повторяющиеся строковые значения полей.
+
+    Применяется только к полям с ограниченным набором значений (названия,
+    состояния), так как интернированные строки не освобождаются.
+    """
+    for name in field_names:
+        value = getattr(obj, name)
+        if isinstance(value, str):
+            object.__setattr__(obj, name, sys.intern(value))
+
+
+# Снимки данных неизменяемы: при каждом обновлении создаются новые объекты,
+# которые заменяют предыдущие целиком.
+
+
+@dataclass(frozen=True, slots=True)
 class Account:
     id: str
     company_id: str
@@ -15,9 +34,20 @@ class Account:
     balance: float | None = None
     charged: float | None = None
     area: float | None = None
+    charged_period: str | None = None
+    # Строки деталей лицевого счёта без отдельного поля: название -> значение.
+    # Хранятся неизменяемым отображением и не участвуют в вычислении хэша
+    extra: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({}), hash=False
+    )
 
     # @todo - вынести api в coordinator или аналогичный механизм
-    api: GUKKrasnodarAPI | None = field(default=None, repr=False)
+    api: GUKKrasnodarAPI | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.extra, MappingProxyType):
+            object.__setattr__(self, "extra", MappingProxyType(dict(self.extra)))
+        _intern_fields(self, ("company_id",))
 
     @property
     def code(self) -> str:
@@ -30,17 +60,30 @@ class Account:
         return await self.api.async_update_account_detail(self)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Meter:
     id: str
     title: str
     detail: str = ""
-    info: str | list[str] | None = None
+    info: str | tuple[str, ...] | None = None
     last_indication: int | None = None
-    last_indication_date: str | None = None
+    last_indication_date: datetime.date | None = None
     push_allowed: bool | None = False
+    # Приём показаний открыт (`accept_measure_set.accept`)
+    submission_open: bool | None = None
+    previous_indication: int | None = None
+    previous_indication_date: datetime.date | None = None
+    next_verification_date: datetime.date | None = None
+    model: str | None = None
+    status: str | None = None
+    calculated_volume: float | None = None
     account: Account | None = None
 
+    def __post_init__(self) -> None:
+        if isinstance(self.info, list):
+            object.__setattr__(self, "info", tuple(self.info))
+        _intern_fields(self, ("title", "detail", "model", "status"))
+
     @property
     def code(self) -> str:
         return self.id
@@ -48,3 +91,30 @@ class Meter:
     async def api_send_indication(self, indications: int | None):
         if indications is not None:
             await self.account.api.async_send_measure(self, value=indications)
+
+
+@dataclass(frozen=True, slots=True)
+class MeterHistoryRow:
+    """Строка истории показаний счётчика"""
+
+    meter_id: str
+    date: datetime.date | None
+    value: int | None = None
+    volume: float | None = None
+    period_name: str | None = None
+    info: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class AccountData:
+    """Данные лицевого счёта, полученные за один цикл обновления.
+
+    Сравнивается по значению, но не хэшируется: содержит словари.
+    """
+
+    __hash__ = None
+
+    account: Account
+    meters: dict[str, Meter] | None = None
+    # Строки истории показаний, полученные в текущем цикле, по кодам счётчиков
+    meter_history: dict[str, list[MeterHistoryRow]] | None = None
@@ -5,38 +5,54 @@ Retrieves indications regarding current state of accounts.
 
 import logging
 from abc import ABC
+from dataclasses import dataclass
 from typing import (
     Any,
     Callable,
     ClassVar,
-    Dict,
     Final,
-    Hashable,
     List,
     Mapping,
     Optional,
+    Tuple,
     TypeVar,
     Union,
 )
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import ServiceResponse
+from homeassistant.core import HomeAssistant, ServiceResponse, callback
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    CONF_USERNAME,
     STATE_UNKNOWN,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
 )
-from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.typing import ConfigType, StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from ._base import (
     SupportedServicesType,
+    GUKKrasnodarCoordinator,
     GUKKrasnodarEntity,
+    get_supported_features,
     make_common_async_setup_entry,
+    rendered_property,
 )
-from .model import Account, Meter
-from ._util import with_auto_auth
+from ._metrics import ApiMetrics
+from ._registry import EntityRegistry
+from .model import AccountData, Meter
+from ._util import mask_value, with_auto_auth
 from .const import (
     ATTR_ACCOUNT_NUMBER,
     ATTR_ADDRESS,
@@ -46,6 +62,7 @@ from .const import (
     ATTR_TITLE,
     CONF_ACCOUNTS,
     CONF_METERS,
+    DATA_COORDINATORS,
     DOMAIN,
     FORMAT_VAR_ACCOUNT_NUMBER,
     FORMAT_VAR_CODE,
@@ -63,6 +80,14 @@ from .const import (
     ATTR_INDICATION_ENTITY,
     ATTR_PUSH_ALLOWED,
     ATTR_AREA,
+    ATTR_CALCULATED_VOLUME,
+    ATTR_CHARGED_PERIOD,
+    ATTR_EXTRA,
+    ATTR_MODEL,
+    ATTR_NEXT_VERIFICATION_DATE,
+    ATTR_PREVIOUS_INDICATION,
+    ATTR_PREVIOUS_INDICATION_DATE,
+    ATTR_STATUS,
 )
 from .exceptions import SessionAPIException
 
@@ -83,20 +108,6 @@ SERVICE_PUSH_INDICATIONS_SCHEMA: Final = PUSH_INDICATIONS_SCHEMA
 _TGUKKrasnodarEntity = TypeVar("_TGUKKrasnodarEntity", bound=GUKKrasnodarEntity)
 
 
-def get_supported_features(
-    from_services: SupportedServicesType, for_object: Any
-) -> int:
-    features = 0
-    for type_feature, services in from_services.items():
-        if type_feature is None:
-            continue
-        check_cls, feature = type_feature
-        if isinstance(for_object, check_cls):
-            features |= feature
-
-    return features
-
-
 class GUKKrasnodarSensor(GUKKrasnodarEntity, SensorEntity, ABC):
     pass
 
@@ -123,7 +134,7 @@ class GUKKrasnodarAccount(GUKKrasnodarSensor):
     def code(self) -> str:
         return self._account.code
 
-    @property
+    @rendered_property
     def unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         return f"{DOMAIN}_account_{self._account.code}"
@@ -137,7 +148,7 @@ class GUKKrasnodarAccount(GUKKrasnodarSensor):
             return 0.0
         return balance
 
-    @property
+    @rendered_property
     def sensor_related_attributes(self) -> Optional[Mapping[str, Any]]:
         account = self._account
 
@@ -147,6 +158,8 @@ class GUKKrasnodarAccount(GUKKrasnodarSensor):
             ATTR_AREA: account.area,
             ATTR_BALANCE: account.balance,
             ATTR_CHARGED: account.charged,
+            ATTR_CHARGED_PERIOD: account.charged_period,
+            ATTR_EXTRA: dict(account.extra),
         }
 
         return attributes
@@ -167,30 +180,26 @@ class GUKKrasnodarAccount(GUKKrasnodarSensor):
     #################################################################################
 
     @classmethod
-    async def async_refresh_accounts(
+    @callback
+    def async_refresh_accounts(
         cls,
-        entities: Dict[Hashable, "GUKKrasnodarAccount"],
-        account: "Account",
-        config_entry: ConfigEntry,
+        entities: EntityRegistry,
+        account_data: AccountData,
+        coordinator: GUKKrasnodarCoordinator,
         account_config: ConfigType,
         async_add_entities: Callable[[List["GUKKrasnodarAccount"], bool], Any],
     ) -> None:
+        account = account_data.account
         entity_key = account.code
-        try:
-            entity = entities[entity_key]
-        except KeyError:
-            entity = cls(account, account_config)
-            entities[entity_key] = entity
+        if entities.get(cls, entity_key) is None:
+            entity = cls(coordinator, account, account_config)
+            entities.add(entity, entity_key)
 
             async_add_entities([entity], False)
-        else:
-            if entity.enabled:
-                entity.async_schedule_update_ha_state(force_refresh=True)
-
-    async def async_update_internal(self) -> None:
-        self._account = await self._account.api_update_account_detail()
 
-        self.register_supported_services(self._account)
+    def update_from_account_data(self, account_data: AccountData) -> bool:
+        self._account = account_data.account
+        return True
 
     #################################################################################
     # Services callbacks
@@ -198,10 +207,7 @@ class GUKKrasnodarAccount(GUKKrasnodarSensor):
 
     @property
     def supported_features(self) -> int:
-        return get_supported_features(
-            self._supported_services,
-            self._account,
-        )
+        return get_supported_features(self.__class__, self._account)
 
 
 class GUKKrasnodarMeter(GUKKrasnodarSensor):
@@ -231,46 +237,46 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
     #################################################################################
 
     @classmethod
-    async def async_refresh_accounts(
+    @callback
+    def async_refresh_accounts(
         cls,
-        entities: Dict[Hashable, Optional[_TGUKKrasnodarEntity]],
-        account: "Account",
-        config_entry: ConfigEntry,
+        entities: EntityRegistry,
+        account_data: AccountData,
+        coordinator: GUKKrasnodarCoordinator,
         account_config: ConfigType,
         async_add_entities: Callable[[List[_TGUKKrasnodarEntity], bool], Any],
-    ):
+    ) -> None:
+        account = account_data.account
         new_meter_entities = []
-        meters = await account.api.async_meters(account)
 
-        for meter in meters:
+        for meter in (account_data.meters or {}).values():
             entity_key = (account.code, meter.code)
-            try:
-                entity = entities[entity_key]
-            except KeyError:
+            if entities.get(cls, entity_key) is None:
                 entity = cls(
+                    coordinator,
                     account,
                     account_config,
                     meter=meter,
                 )
-                entities[entity_key] = entity
+                entities.add(entity, entity_key)
                 new_meter_entities.append(entity)
-            else:
-                if entity.enabled:
-                    entity.async_schedule_update_ha_state(force_refresh=True)
 
         if new_meter_entities:
             async_add_entities(new_meter_entities, False)
 
-    async def async_update_internal(self) -> None:
-        meters = await self._account.api.async_meters(self._account)
-        meter_code = self._meter.code
-        meter = next((m for m in meters if m.code == meter_code), None)
+    def update_from_account_data(self, account_data: AccountData) -> bool:
+        if account_data.meters is None:
+            return False
+
+        meter = account_data.meters.get(self._meter.code)
 
         if meter is None:
             self.hass.async_create_task(self.async_remove())
-        else:
-            self.register_supported_services(meter)
-            self._meter = meter
+            return False
+
+        self._account = account_data.account
+        self._meter = meter
+        return True
 
     #################################################################################
     # Data-oriented implementation of inherent class
@@ -281,6 +287,10 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
         return self._meter.code
 
     @property
+    def render_source(self) -> Tuple[Any, ...]:
+        return self.name_format, self._account, self._meter
+
+    @rendered_property
     def unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         meter = self._meter
@@ -295,7 +305,7 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
             return 0
         return indication
 
-    @property
+    @rendered_property
     def sensor_related_attributes(self) -> Optional[Mapping[str, Any]]:
         meter = self._meter
 
@@ -304,10 +314,16 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
             ATTR_DETAIL: meter.detail,
             ATTR_LAST_INDICATION: meter.last_indication,
             ATTR_LAST_INDICATION_DATE: meter.last_indication_date,
+            ATTR_PREVIOUS_INDICATION: meter.previous_indication,
+            ATTR_PREVIOUS_INDICATION_DATE: meter.previous_indication_date,
+            ATTR_NEXT_VERIFICATION_DATE: meter.next_verification_date,
+            ATTR_MODEL: meter.model,
+            ATTR_STATUS: meter.status,
+            ATTR_CALCULATED_VOLUME: meter.calculated_volume,
             ATTR_PUSH_ALLOWED: meter.push_allowed,
         }
 
-        if isinstance(meter.info, list):
+        if isinstance(meter.info, (list, tuple)):
             for idx, info in enumerate(meter.info):
                 attributes[f"{ATTR_INFO}_{idx+1}"] = info
         else:
@@ -381,6 +397,7 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
         else:
             event_data[ATTR_COMMENT] = "Показания успешно отправлены"
             event_data[ATTR_SUCCESS] = True
+            self.coordinator.async_notify_push()
             self.async_schedule_update_ha_state(force_refresh=True)
 
         finally:
@@ -394,7 +411,119 @@ class GUKKrasnodarMeter(GUKKrasnodarSensor):
             return event_data
 
 
-async_setup_entry = make_common_async_setup_entry(
+@dataclass(frozen=True, kw_only=True)
+class GUKKrasnodarMetricSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[ApiMetrics], StateType]
+
+
+METRIC_SENSOR_DESCRIPTIONS: Final = (
+    GUKKrasnodarMetricSensorDescription(
+        key="requests",
+        name="Запросы к ЛК",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.requests_count,
+    ),
+    GUKKrasnodarMetricSensorDescription(
+        key="request_errors",
+        name="Ошибки запросов к ЛК",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.errors_count,
+    ),
+    GUKKrasnodarMetricSensorDescription(
+        key="latency_p95",
+        name="Время ответа ЛК (p95)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.latency_quantile(0.95),
+    ),
+    GUKKrasnodarMetricSensorDescription(
+        key="bytes_received",
+        name="Получено от ЛК",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.bytes_received,
+    ),
+    GUKKrasnodarMetricSensorDescription(
+        key="logins",
+        name="Авторизации в ЛК",
+        icon="mdi:login",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.logins,
+    ),
+    GUKKrasnodarMetricSensorDescription(
+        key="refresh_duration",
+        name="Длительность обновления",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.last_refresh_duration,
+    ),
+)
+
+
+class GUKKrasnodarMetricSensor(
+    CoordinatorEntity[GUKKrasnodarCoordinator], SensorEntity
+):
+    """Диагностический показатель работы конфигурационной записи"""
+
+    entity_description: GUKKrasnodarMetricSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: GUKKrasnodarCoordinator,
+        description: GUKKrasnodarMetricSensorDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+
+        config_entry = coordinator.config_entry
+        self._attr_unique_id = (
+            f"{DOMAIN}_metrics_{config_entry.entry_id}_{description.key}"
+        )
+        self._attr_device_info = {
+            "name": f"ЛК ГУК Краснодар ({mask_value(config_entry.data[CONF_USERNAME])})",
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "manufacturer": "GUK Krasnodar",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+    @property
+    def available(self) -> bool:
+        # Показатели доступны и при ошибках обновления
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self.coordinator.api.metrics)
+
+
+_async_setup_account_entities = make_common_async_setup_entry(
     GUKKrasnodarAccount,
     GUKKrasnodarMeter,
 )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities,
+) -> None:
+    await _async_setup_account_entities(hass, config_entry, async_add_entities)
+
+    coordinator: GUKKrasnodarCoordinator = hass.data[DATA_COORDINATORS][
+        config_entry.entry_id
+    ]
+    async_add_entities(
+        GUKKrasnodarMetricSensor(coordinator, description)
+        for description in METRIC_SENSOR_DESCRIPTIONS
+    )
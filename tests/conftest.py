@@ -31,6 +31,7 @@ FIXTURE_JSON_AUTH_BAD_PASSWORD = "auth_bad_password.json"
 FIXTURE_JSON_ACCOUNTS = "accounts.json"
 FIXTURE_JSON_ACCOUNT_DETAIL = "account_detail.json"
 FIXTURE_JSON_METERS = "meters.json"
+FIXTURE_JSON_METER_HISTORY = "meter_history.json"
 
 CONFIG_BASE: Final = {
     CONF_USERNAME: "username@domain.ru",
@@ -47,7 +48,9 @@ CONFIG_FAST_UPDATES: Final = {
     },
 }
 
+FIXTURE_ACCOUNTS = json.loads(load_fixture(f"{FIXTURE_JSON_ACCOUNTS}"))
 FIXTURE_ACCOUNT_DETAIL = json.loads(load_fixture(f"{FIXTURE_JSON_ACCOUNT_DETAIL}"))
+FIXTURE_METER_HISTORY = json.loads(load_fixture(f"{FIXTURE_JSON_METER_HISTORY}"))
 
 logging.getLogger("custom_components.guk_krasnodar").setLevel(logging.INFO)
 
@@ -62,9 +65,16 @@ def auto_enable_custom_integrations(enable_custom_integrations):
 def gukk_aioclient_mock(aioclient_mock: AiohttpClientMocker):
     """Create a mock config entry."""
 
+    async def _accounts(method, url, data):
+        return AiohttpClientMockResponse(
+            method=method,
+            url=url,
+            json=FIXTURE_ACCOUNTS,
+        )
+
     aioclient_mock.get(
         "https://lk.gukkrasnodar.ru/api/v1/user/accounts",
-        text=load_fixture(f"{FIXTURE_JSON_ACCOUNTS}"),
+        side_effect=_accounts,
     )
 
     async def _account_detail(method, url, data):
@@ -85,6 +95,25 @@ def gukk_aioclient_mock(aioclient_mock: AiohttpClientMocker):
         text=load_fixture(f"{FIXTURE_JSON_METERS}"),
     )
 
+    async def _meter_history(method, url, data):
+        data = json.loads(data)
+        history = dict(FIXTURE_METER_HISTORY["meter_measure_history"])
+        rows = history["meter_measure"]
+        offset = data["offset"]
+        limit = data["limit"] or len(rows)
+        history["meter_measure"] = rows[offset : offset + limit]
+        history["count_meter_measure"] = str(len(rows))
+        return AiohttpClientMockResponse(
+            method=method,
+            url=url,
+            json={**FIXTURE_METER_HISTORY, "meter_measure_history": history},
+        )
+
+    aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/account/meter/measure/history",
+        side_effect=_meter_history,
+    )
+
     async def _auth_check(method, url, data):
         data = json.loads(data)
         if data["login"] == "username@domain.ru" and data["password"] == "password":
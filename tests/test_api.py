@@ -1,8 +1,27 @@
 """Test raw api."""
 
+import asyncio
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+import json
+from http import HTTPStatus
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
+)
+
 from .conftest import mock_gukk_aiohttp_client
-from custom_components.guk_krasnodar.exceptions import AccessDenied
-from custom_components.guk_krasnodar.guk_krasnodar_api import GUKKrasnodarAPI
+from custom_components.guk_krasnodar._pool import ConnectionPool
+from custom_components.guk_krasnodar._rate_limit import HostRateLimiter
+from custom_components.guk_krasnodar._retry import RetryPolicy
+from custom_components.guk_krasnodar._util import with_auto_auth
+from custom_components.guk_krasnodar.exceptions import AccessDenied, ResponseError
+from custom_components.guk_krasnodar.guk_krasnodar_api import (
+    GUKKrasnodarAPI,
+    _parse_meter_info,
+)
 
 
 async def test_api_login_fail(hass, gukk_aioclient_mock):
@@ -48,10 +67,55 @@ async def test_api_meters(hass, gukk_aioclient_mock, mock_account):
     assert len(meters) == 1
 
     assert meters[0].last_indication == 123
-    assert meters[0].last_indication_date == "18.02.2025"
+    assert meters[0].last_indication_date == date(2025, 2, 18)
+    assert meters[0].previous_indication == 113
+    assert meters[0].previous_indication_date == date(2025, 1, 20)
+    assert meters[0].next_verification_date == date(2029, 3, 14)
+    assert meters[0].model is None
+    assert meters[0].status == "В работе"
+    assert meters[0].calculated_volume == 10
     assert meters[0].push_allowed
 
 
+def test_parse_meter_info_previous_indication():
+    assert _parse_meter_info(
+        ["Предыдущие показания: <strong>113</strong> от 20.01.2025г.", "Прочее"]
+    ) == {
+        "previous_indication": 113,
+        "previous_indication_date": date(2025, 1, 20),
+        "last_indication": 113,
+        "last_indication_date": date(2025, 1, 20),
+    }
+    assert _parse_meter_info(None) == {
+        "last_indication": None,
+        "last_indication_date": None,
+    }
+
+
+def test_parse_meter_info_line_order():
+    info = [
+        "Дата следующей поверки: 14.03.2029",
+        "Модель: Информация отсутствует",
+        "Состояние: В работе",
+        "Предыдущие показания: <strong>113</strong> от 20.01.2025г.",
+        "Текущие показания: <strong>123</strong> от 18.02.2025г.",
+        " Расчетный объем: 10 (расчетный объем без учета перерасчетов)",
+    ]
+    expected = {
+        "next_verification_date": date(2029, 3, 14),
+        "model": None,
+        "status": "В работе",
+        "previous_indication": 113,
+        "previous_indication_date": date(2025, 1, 20),
+        "last_indication": 123,
+        "last_indication_date": date(2025, 2, 18),
+        "calculated_volume": 10.0,
+    }
+    assert _parse_meter_info(info) == expected
+    # Строки в другом порядке и неизвестные строки разбираются построчно
+    assert _parse_meter_info(["Прочее", *reversed(info)]) == expected
+
+
 async def test_api_update_account_detail(hass, gukk_aioclient_mock, mock_account):
     with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
         api: GUKKrasnodarAPI = GUKKrasnodarAPI(username="username", password="password")
@@ -61,7 +125,351 @@ async def test_api_update_account_detail(hass, gukk_aioclient_mock, mock_account
     account = accounts[0]
     assert account.balance is None
 
-    await api.async_update_account_detail(account)
+    updated_account = await api.async_update_account_detail(account)
+    assert account.balance is None
+    account = updated_account
     assert account.balance == 1234.56
     assert account.charged == 6543.21
+    assert account.charged_period == "Февраль 2025"
     assert account.area == 99.99
+    assert account.extra == {
+        "Лицевой счет": "230123456",
+        "Адрес": "ул.Красная, д.1 кв.1",
+        "Кол-во чел. на л/с": None,
+    }
+    # Неизменяемый снимок хэшируется; отображение `extra` не изменяется
+    assert hash(account) == hash(replace(account))
+    with pytest.raises(TypeError):
+        account.extra["Адрес"] = ""
+
+
+async def test_api_coalesce_concurrent_requests(
+    hass, gukk_aioclient_mock, mock_account
+):
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(username="username", password="password")
+
+    results = await asyncio.gather(*(api.async_meters(mock_account) for _ in range(3)))
+
+    assert all(len(meters) == 1 for meters in results)
+    assert api.requests_count == 3
+    assert api.coalesced_requests_count == 2
+    assert gukk_aioclient_mock.call_count == 1
+
+    await api.async_meters(mock_account)
+    assert api.coalesced_requests_count == 2
+    assert gukk_aioclient_mock.call_count == 2
+
+
+async def test_api_response_cache(hass, gukk_aioclient_mock, mock_account):
+    gukk_aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/account/meter/measure/set",
+        json={"success": True},
+    )
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username", password="password", cache_ttl=60
+        )
+
+    meters = await api.async_meters(mock_account)
+    await api.async_meters(mock_account)
+    await api.async_update_account_detail(mock_account)
+    await api.async_update_account_detail(mock_account)
+
+    assert gukk_aioclient_mock.call_count == 2
+    assert api.cache_hits == 2
+    assert api.cache_misses == 2
+
+    await api.async_send_measure(meters[0], 124)
+    assert gukk_aioclient_mock.call_count == 3
+
+    # Сброшен только кэш счётчиков лицевого счёта
+    await api.async_meters(mock_account)
+    await api.async_update_account_detail(mock_account)
+    assert gukk_aioclient_mock.call_count == 4
+    assert api.cache_hits == 3
+
+
+async def test_api_login_single_flight(hass, gukk_aioclient_mock):
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username@domain.ru", password="password"
+        )
+
+    await asyncio.gather(*(api.async_login() for _ in range(5)))
+
+    assert api._token == "TOKEN"
+    assert api.logins_count == 1
+    assert gukk_aioclient_mock.call_count == 1
+
+
+async def test_api_token_expired_relogin(hass, aioclient_mock):
+    accounts_calls = 0
+
+    async def _accounts(method, url, data):
+        nonlocal accounts_calls
+        accounts_calls += 1
+        if accounts_calls == 1:
+            return AiohttpClientMockResponse(
+                method=method,
+                url=url,
+                json={"success": False, "code": 401, "message": "expired"},
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+        return AiohttpClientMockResponse(
+            method=method, url=url, text=load_fixture("accounts.json")
+        )
+
+    aioclient_mock.get(
+        "https://lk.gukkrasnodar.ru/api/v1/user/accounts", side_effect=_accounts
+    )
+    aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/login",
+        text=load_fixture("auth.json"),
+    )
+
+    with mock_gukk_aiohttp_client(hass, aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username@domain.ru", password="password"
+        )
+
+    api._token = "EXPIRED"
+
+    results = await asyncio.gather(
+        *(with_auto_auth(api, api.async_accounts) for _ in range(3))
+    )
+
+    assert all(len(accounts) == 1 for accounts in results)
+    assert api._token == "TOKEN"
+    assert api.logins_count == 1
+
+
+async def test_api_token_proactive_refresh(hass, gukk_aioclient_mock):
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username@domain.ru",
+            password="password",
+            token_lifetime=timedelta(hours=1),
+        )
+
+    await api.async_login()
+    await api.async_accounts()
+    assert api.logins_count == 1
+
+    api._token_issued_at -= 3600
+    assert api.token_stale
+
+    await api.async_accounts()
+    assert api.logins_count == 2
+    assert not api.token_stale
+
+
+async def test_api_retry_server_error(hass, aioclient_mock, mock_account):
+    meters_calls = 0
+
+    async def _meters(method, url, data):
+        nonlocal meters_calls
+        meters_calls += 1
+        if meters_calls < 3:
+            return AiohttpClientMockResponse(
+                method=method,
+                url=url,
+                json={"success": False},
+                status=HTTPStatus.SERVICE_UNAVAILABLE,
+            )
+        return AiohttpClientMockResponse(
+            method=method, url=url, text=load_fixture("meters.json")
+        )
+
+    aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/account/meters", side_effect=_meters
+    )
+    aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/account/meter/measure/set",
+        json={"success": False},
+        status=HTTPStatus.SERVICE_UNAVAILABLE,
+    )
+
+    with mock_gukk_aiohttp_client(hass, aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username",
+            password="password",
+            retry_policy=RetryPolicy(base_delay=0, budget=2),
+        )
+
+    with api.retry_policy.budget_scope() as budget:
+        meters = await api.async_meters(mock_account)
+    assert len(meters) == 1
+    assert meters_calls == 3
+    assert api.retry_policy.retries_count == 2
+    assert budget.left == 0
+
+    # Передача показаний не повторяется
+    with pytest.raises(ResponseError):
+        await api.async_send_measure(meters[0], 124)
+    assert api.retry_policy.retries_count == 2
+
+    # Бюджет повторов исчерпан
+    meters_calls = 0
+    with api.retry_policy.budget_scope(budget), pytest.raises(ResponseError):
+        await api.async_meters(mock_account)
+    assert meters_calls == 1
+
+    # Бюджеты разных операций независимы
+    meters_calls = 0
+    with api.retry_policy.budget_scope() as other_budget:
+        await api.async_meters(mock_account)
+    assert meters_calls == 3
+    assert other_budget.left == 0
+    assert budget.left == 0
+
+
+async def test_api_iter_meter_history(hass, gukk_aioclient_mock, mock_account):
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(username="username", password="password")
+
+    meters = await api.async_meters(mock_account)
+
+    rows = [
+        row
+        async for row in api.async_iter_meter_history(
+            mock_account,
+            meters,
+            begin=datetime(2024, 8, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 3, 1, tzinfo=timezone.utc),
+            page_size=3,
+        )
+    ]
+
+    # Запрос счётчиков и две страницы истории
+    assert gukk_aioclient_mock.call_count == 3
+    assert [row.value for row in rows] == [123, 113, 103, 100]
+    assert rows[0].meter_id == "67890"
+    assert rows[0].date == date(2025, 2, 18)
+    assert rows[0].volume == 10.0
+    assert rows[0].period_name == "Февраль 2025"
+
+    request_data = json.loads(gukk_aioclient_mock.mock_calls[-1][2])
+    assert request_data["offset"] == 3
+    assert request_data["limit"] == 3
+    assert request_data["id_meters"] == ["67890"]
+    assert request_data["begin_date"] == "2024-08-01T00:00:00.000Z"
+
+
+async def test_api_shared_connection_pool(hass):
+    from aiohttp import web
+
+    async def _login(request: web.Request) -> web.Response:
+        return web.Response(
+            text=load_fixture("auth.json"), content_type="application/json"
+        )
+
+    app = web.Application()
+    app.router.add_post("/api/v1/user/login", _login)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    pool = ConnectionPool()
+    apis = [
+        GUKKrasnodarAPI(
+            username="username@domain.ru",
+            password="password",
+            base_url=f"http://127.0.0.1:{port}",
+            pool=pool,
+        )
+        for _ in range(2)
+    ]
+
+    try:
+        for api in apis:
+            await api.async_login()
+            assert api.authorized
+
+        # Второй экземпляр API использует соединение, открытое первым
+        assert pool.created_count == 1
+        assert pool.reused_count == 1
+        assert pool.reuse_ratio == 0.5
+        assert pool.open_connections == 1
+
+        await apis[0].async_close()
+        assert pool.open_connections == 1
+    finally:
+        for api in apis:
+            await api.async_close()
+        await pool.async_close()
+        await runner.cleanup()
+
+    assert pool.open_connections == 0
+
+
+async def test_host_rate_limiter():
+    limiter = HostRateLimiter(rate=50.0, max_concurrent=1, burst=1)
+    max_active = 0
+
+    async def _request():
+        nonlocal max_active
+        async with limiter.async_limit():
+            max_active = max(max_active, limiter.active_count)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(_request() for _ in range(3)))
+
+    assert max_active == 1
+    assert limiter.active_count == 0
+    # Первый запрос использует запас, остальные ожидают пополнения
+    assert limiter.throttled_count == 2
+    assert limiter.throttled_time == pytest.approx(0.04, abs=0.01)
+
+
+async def test_host_rate_limiter_entry_limits():
+    limiter = HostRateLimiter(rate=2.0, max_concurrent=4)
+
+    remove_strict = limiter.async_set_entry_limits("strict", 0.5, 1)
+    remove_loose = limiter.async_set_entry_limits("loose", 1.0, 3)
+    assert (limiter.rate, limiter.max_concurrent) == (0.5, 1)
+
+    # Ограничения выгруженной записи больше не действуют
+    remove_strict()
+    assert (limiter.rate, limiter.max_concurrent) == (1.0, 3)
+
+    remove_loose()
+    assert (limiter.rate, limiter.max_concurrent) == (2.0, 4)
+
+
+async def test_api_send_measure_token_expired(hass, gukk_aioclient_mock, mock_account):
+    set_calls = 0
+
+    async def _measure_set(method, url, data):
+        nonlocal set_calls
+        set_calls += 1
+        if set_calls == 1:
+            return AiohttpClientMockResponse(
+                method=method,
+                url=url,
+                json={"success": False, "code": "token_expired"},
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+        return AiohttpClientMockResponse(method=method, url=url, json={"success": True})
+
+    gukk_aioclient_mock.post(
+        "https://lk.gukkrasnodar.ru/api/v1/user/account/meter/measure/set",
+        side_effect=_measure_set,
+    )
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        api: GUKKrasnodarAPI = GUKKrasnodarAPI(
+            username="username@domain.ru", password="password"
+        )
+
+    await api.async_login()
+    meters = await api.async_meters(mock_account)
+
+    # Истёкший токен не маскируется ошибкой передачи: выполняется повторная
+    # авторизация и передача показаний
+    await with_auto_auth(api, api.async_send_measure, meters[0], 124)
+    assert set_calls == 2
+    assert api.logins_count == 2
@@ -1,6 +1,9 @@
 """Test component setup."""
 
-from homeassistant.const import CONF_USERNAME
+from unittest import mock
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
@@ -25,6 +28,7 @@ async def test_config_in_config_entry(hass: HomeAssistant, gukk_aioclient_mock)
 
     with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
         assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
 
     # config_entry created for access point
     config_entries = hass.config_entries.async_entries(DOMAIN)
@@ -41,6 +45,10 @@ async def test_config_in_config_entry(hass: HomeAssistant, gukk_aioclient_mock)
         GUKKrasnodarAccount,
     )
 
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    assert hass.data[DATA_COORDINATORS][entity_id].next_refresh is not None
+
 
 async def test_setup_services_and_unload_services(
     hass: HomeAssistant, gukk_aioclient_mock
@@ -52,6 +60,7 @@ async def test_setup_services_and_unload_services(
     # MockConfigEntry(domain=DOMAIN, data=mock_config).add_to_hass(hass)
     with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
         assert await async_setup_component(hass, DOMAIN, {DOMAIN: mock_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
 
     config_entries = hass.config_entries.async_entries(DOMAIN)
     assert len(config_entries) == 1
@@ -60,6 +69,262 @@ async def test_setup_services_and_unload_services(
     gukk_services = hass.services.async_services()[DOMAIN]
     assert len(gukk_services) == 1
 
+    from custom_components.guk_krasnodar.const import DATA_API_OBJECTS
+
+    api = hass.data[DATA_API_OBJECTS][config_entries[0].entry_id]
+
     await hass.config_entries.async_unload(config_entries[0].entry_id)
     # Check services are removed
     assert not hass.services.async_services().get(DOMAIN)
+    # Сессия API закрыта при выгрузке
+    assert api._session.closed
+
+
+async def test_services_registered_once(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Службы регистрируются один раз, а не при каждом обновлении объектов."""
+
+    from homeassistant.helpers.entity_platform import EntityPlatform
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    register_service = mock.Mock(wraps=EntityPlatform.async_register_entity_service)
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch.object(
+            EntityPlatform,
+            "async_register_entity_service",
+            autospec=True,
+            side_effect=register_service,
+        ) as patched_register,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        config_entry = hass.config_entries.async_entries(DOMAIN)[0]
+        coordinator = hass.data[DATA_COORDINATORS][config_entry.entry_id]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert patched_register.call_count == 1
+    assert patched_register.call_args.args[1] == "push_indications"
+
+
+async def test_deferred_setup_auth_failed(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Отказ в авторизации не блокирует настройку и запускает повторную аутентификацию."""
+
+    from homeassistant.config_entries import ConfigEntryState
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    entry_config = {**CONFIG_BASE, CONF_PASSWORD: "password_bad"}
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch.object(ConfigEntry, "async_start_reauth") as start_reauth,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+
+        config_entry = hass.config_entries.async_entries(DOMAIN)[0]
+        assert config_entry.state == ConfigEntryState.LOADED
+
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DATA_COORDINATORS][config_entry.entry_id]
+    assert not coordinator.last_update_success
+    assert not coordinator.ready.is_set()
+    start_reauth.assert_called_once()
+
+
+async def test_unload_stops_setup_refresh(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Выгрузка прерывает повторы первичного получения данных и освобождает
+    место записи в планировщике."""
+
+    from homeassistant.helpers.update_coordinator import UpdateFailed
+
+    from custom_components.guk_krasnodar._base import GUKKrasnodarCoordinator
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch.object(
+            GUKKrasnodarCoordinator,
+            "_async_update_data",
+            side_effect=UpdateFailed("ЛК недоступен"),
+        ),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done()
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        setup_task = coordinator._setup_refresh_task
+        # Первая попытка не удалась, ожидается повтор
+        assert setup_task is not None and not setup_task.done()
+        assert coordinator.next_refresh is not None
+
+        await hass.config_entries.async_unload(entry_id)
+
+    assert setup_task.cancelled()
+    assert coordinator.next_refresh is None
+    assert coordinator.api._session.closed
+
+
+async def test_refresh_scheduler_staggers_entries(hass: HomeAssistant) -> None:
+    """Записи обновляются со смещением фазы внутри окна обновления."""
+
+    from datetime import timedelta
+
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.guk_krasnodar._scheduler import RefreshScheduler
+
+    interval = timedelta(hours=6)
+    scheduler = RefreshScheduler(hass, window=interval)
+    first_action = mock.AsyncMock()
+    second_action = mock.AsyncMock()
+
+    remove_first = scheduler.async_add("entry_a", interval, first_action)
+    remove_second = scheduler.async_add("entry_b", interval, second_action)
+
+    assert scheduler.get_phase_offset("entry_a") == timedelta()
+    assert scheduler.get_phase_offset("entry_b") == timedelta(hours=3)
+
+    first_run = scheduler.get_next_run("entry_a")
+    second_run = scheduler.get_next_run("entry_b")
+    # Запуски разнесены на половину интервала (с учётом случайной добавки)
+    spread = abs((second_run - first_run).total_seconds()) % interval.total_seconds()
+    assert min(spread, interval.total_seconds() - spread) > 2.5 * 3600
+
+    async_fire_time_changed(hass, min(first_run, second_run))
+    await hass.async_block_till_done()
+
+    assert first_action.await_count + second_action.await_count == 1
+    assert scheduler.get_next_run("entry_a") > first_run or (
+        scheduler.get_next_run("entry_b") > second_run
+    )
+
+    remove_first()
+    remove_second()
+    assert scheduler.get_next_run("entry_a") is None
+
+
+async def test_adaptive_polling_policy(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Интервал сокращается при приёме показаний и растёт при неизменных данных."""
+
+    from dataclasses import replace
+    from datetime import timedelta
+
+    from custom_components.guk_krasnodar._polling import AdaptivePollingPolicy
+    from custom_components.guk_krasnodar._schema import MIN_SCAN_INTERVAL
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    coordinator = hass.data[DATA_COORDINATORS][entry_id]
+
+    # Приём показаний открыт (volume_allow и accept_measure_set.accept)
+    assert coordinator.current_refresh_interval == timedelta(hours=6) / 4
+    assert coordinator.scheduler.get_interval(entry_id) == timedelta(hours=6) / 4
+
+    open_data = coordinator.data
+    closed_data = {
+        code: replace(
+            account_data,
+            meters={
+                meter_code: replace(meter, submission_open=False)
+                for meter_code, meter in account_data.meters.items()
+            },
+        )
+        for code, account_data in open_data.items()
+    }
+
+    policy = AdaptivePollingPolicy(timedelta(hours=6))
+    assert policy.update(None, closed_data) == timedelta(hours=6)
+    assert policy.update(closed_data, closed_data) == timedelta(hours=12)
+    assert policy.update(closed_data, closed_data) == timedelta(hours=24)
+    assert policy.update(closed_data, closed_data) == timedelta(hours=24)
+
+    assert policy.notify_push() == MIN_SCAN_INTERVAL
+    assert policy.update(closed_data, closed_data) == MIN_SCAN_INTERVAL
+    # Переданные показания появились в ЛК
+    assert policy.update(closed_data, open_data) == timedelta(hours=6) / 4
+
+
+async def test_api_metrics_recorded(hass: HomeAssistant, gukk_aioclient_mock) -> None:
+    """Запросы, авторизации и циклы обновления учитываются в показателях."""
+
+    from custom_components.guk_krasnodar._metrics import Histogram, render_metrics
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS, DATA_METRICS
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    metrics = hass.data[DATA_COORDINATORS][entry_id].api.metrics
+    assert hass.data[DATA_METRICS][entry_id] is metrics
+
+    assert metrics.logins == 1
+    assert metrics.requests_count > 0
+    assert metrics.errors_count == 0
+    assert metrics.bytes_received > 0
+    assert metrics.refresh.count >= 1
+    assert metrics.latency_quantile(0.95) is not None
+
+    text = render_metrics(hass.data[DATA_METRICS])
+    assert f'guk_krasnodar_logins_total{{entry="{entry_id}"}} 1' in text
+    assert "# TYPE guk_krasnodar_request_duration_seconds histogram" in text
+
+    from homeassistant.helpers.http import KEY_HASS
+
+    from custom_components.guk_krasnodar._metrics_view import GUKKrasnodarMetricsView
+
+    response = await GUKKrasnodarMetricsView().get(mock.Mock(app={KEY_HASS: hass}))
+    assert response.body.decode() == text
+    assert response.content_type == "text/plain"
+
+    histogram = Histogram((1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 5.0):
+        histogram.observe(value)
+    assert histogram.cumulative_counts() == [1, 3, 4]
+    assert histogram.quantile(0.5) == 1.5
+
+    await hass.config_entries.async_unload(entry_id)
+    assert entry_id not in hass.data[DATA_METRICS]
+
+
+async def test_options_flow_fetch_codes_relogin(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Параметры интеграции доступны до завершения фоновой авторизации."""
+
+    from custom_components.guk_krasnodar.config_flow import GUKKrasnodarOptionsFlow
+    from custom_components.guk_krasnodar.const import DATA_COORDINATORS
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    config_entry = hass.config_entries.async_entries(DOMAIN)[0]
+    api = hass.data[DATA_COORDINATORS][config_entry.entry_id].api
+    api._token = None
+    logins_count = api.logins_count
+
+    flow = GUKKrasnodarOptionsFlow(config_entry)
+    flow.hass = hass
+
+    assert await flow.async_fetch_config_codes() == {
+        "accounts": ["1_12345"],
+        "meters": ["67890"],
+    }
+    assert api.logins_count == logins_count + 1
@@ -1,15 +1,37 @@
 """Test sensors refresh."""
 
+import asyncio
+from datetime import date, timedelta
+import json
 import logging
+from unittest import mock
 
+import pytest
+from homeassistant.const import CONF_DEFAULT
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
 from conftest import (
+    CONFIG_BASE,
     CONFIG_FAST_UPDATES,
     mock_gukk_aiohttp_client,
 )
+from .conftest import FIXTURE_ACCOUNT_DETAIL, FIXTURE_ACCOUNTS
 from guk_krasnodar import DOMAIN
+from guk_krasnodar.const import (
+    CONF_ACCOUNT_TIMEOUT,
+    ATTR_BALANCE,
+    CONF_ACCOUNTS,
+    CONF_METER_HISTORY,
+    CONF_METERS,
+    DATA_COORDINATORS,
+    DATA_ENTITIES,
+)
+from custom_components.guk_krasnodar.model import MeterHistoryRow
+from custom_components.guk_krasnodar.sensor import (
+    GUKKrasnodarAccount,
+    GUKKrasnodarMeter,
+)
 
 
 async def test_entries_update(hass: HomeAssistant, gukk_aioclient_mock) -> None:
@@ -26,6 +48,7 @@ async def test_entries_update(hass: HomeAssistant, gukk_aioclient_mock) -> None:
     # @todo заменить на мок?
     with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
         assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
 
     assert hass.states.get("sensor.guk_krasnodar_1_12345_meter_67890").state == "123"
     assert hass.states.get("sensor.guk_krasnodar_1_12345_account").state == "1234.56"
@@ -35,3 +58,468 @@ async def test_entries_update(hass: HomeAssistant, gukk_aioclient_mock) -> None:
     # await hass.async_block_till_done()
     # await asyncio.sleep(3)
     # assert hass.states.get("sensor.guk_krasnodar_1_12345_account").state == "5678.90"
+
+
+async def test_coordinator_single_fetch_per_cycle(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Детали и счётчики лицевого счёта запрашиваются один раз за цикл."""
+
+    def _calls_count(path: str) -> int:
+        return sum(
+            1 for call in gukk_aioclient_mock.mock_calls if str(call[1]).endswith(path)
+        )
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert _calls_count("/account/info/extend") == 1
+    assert _calls_count("/account/meters") == 1
+
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    await hass.data[DATA_COORDINATORS][entry_id].async_refresh()
+
+    assert _calls_count("/account/info/extend") == 2
+    assert _calls_count("/account/meters") == 2
+    assert hass.states.get("sensor.guk_krasnodar_1_12345_meter_67890").state == "123"
+
+
+async def test_request_plan_skips_disabled(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Для отключённых объектов запросы к ЛК не выполняются."""
+
+    def _calls_count(path: str) -> int:
+        return sum(
+            1 for call in gukk_aioclient_mock.mock_calls if str(call[1]).endswith(path)
+        )
+
+    entry_config = {**CONFIG_BASE, CONF_DEFAULT: {CONF_ACCOUNTS: False}}
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert _calls_count("/account/info/extend") == 0
+        assert _calls_count("/account/meters") == 1
+        assert hass.states.get("sensor.guk_krasnodar_1_12345_account") is None
+        assert hass.states.get("sensor.guk_krasnodar_1_12345_meter_67890")
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        coordinator.final_config[CONF_DEFAULT][CONF_METERS] = False
+        await coordinator.async_refresh()
+
+    # Лицевой счёт без объектов не требует запросов
+    assert _calls_count("/account/info/extend") == 0
+    assert _calls_count("/account/meters") == 1
+    assert coordinator.data == {}
+
+
+async def test_meter_history_incremental_sync(
+    hass: HomeAssistant, gukk_aioclient_mock, hass_storage
+) -> None:
+    """История показаний запрашивается только после сохранённой отметки."""
+
+    def _history_requests() -> list:
+        return [
+            json.loads(call[2])
+            for call in gukk_aioclient_mock.mock_calls
+            if str(call[1]).endswith("/meter/measure/history")
+        ]
+
+    entry_config = {**CONFIG_BASE, CONF_DEFAULT: {CONF_METER_HISTORY: True}}
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    coordinator = hass.data[DATA_COORDINATORS][entry_id]
+    account_data = coordinator.data["1_12345"]
+
+    assert [row.value for row in account_data.meter_history["67890"]] == [
+        123,
+        113,
+        103,
+        100,
+    ]
+    assert coordinator.history_sync.get_mark(account_data.account, "67890") == date(
+        2025, 2, 18
+    )
+
+    await coordinator.async_refresh()
+
+    assert coordinator.data["1_12345"].meter_history == {"67890": []}
+    assert _history_requests()[-1]["begin_date"] == "2025-02-18T00:00:00.000Z"
+
+    # Повторные показания, переданные в день отметки, не теряются
+    last_row = account_data.meter_history["67890"][0]
+    same_day_row = MeterHistoryRow(
+        meter_id="67890", date=last_row.date, value=125, volume=12.0
+    )
+
+    async def _iter_meter_history(*args, **kwargs):
+        for row in (last_row, same_day_row):
+            yield row
+
+    with mock.patch.object(
+        coordinator.api, "async_iter_meter_history", _iter_meter_history
+    ):
+        await coordinator.async_refresh()
+        assert coordinator.data["1_12345"].meter_history == {"67890": [same_day_row]}
+
+        await coordinator.async_refresh()
+        assert coordinator.data["1_12345"].meter_history == {"67890": []}
+
+    await hass.config_entries.async_unload(entry_id)
+    await hass.async_block_till_done()
+
+    assert hass_storage[f"{DOMAIN}.{entry_id}.history"]["data"] == {
+        "marks": {
+            "1_12345:67890": {
+                "date": "2025-02-18",
+                "rows": [
+                    [123, 10.0, "Февраль 2025", "Объем:10. Период учета: Февраль 2025"],
+                    [125, 12.0, None, None],
+                ],
+            }
+        }
+    }
+
+
+async def test_meter_history_statistics_backfill(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """История показаний импортируется в долгосрочную статистику."""
+
+    entry_config = {**CONFIG_BASE, CONF_DEFAULT: {CONF_METER_HISTORY: True}}
+    hass.config.components.add("recorder")
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch(
+            "custom_components.guk_krasnodar._statistics.async_add_external_statistics"
+        ) as add_statistics,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        backfill = coordinator.statistics_backfill
+        account = coordinator.data["1_12345"].account
+
+        await backfill._task
+
+        assert add_statistics.call_count == 1
+        _, metadata, statistics = add_statistics.call_args.args
+        assert metadata["statistic_id"] == "guk_krasnodar:meter_1_12345_67890"
+        assert metadata["has_sum"]
+        assert metadata["unit_of_measurement"] == "m³"
+        assert [row["state"] for row in statistics] == [100, 103, 113, 123]
+        assert [row["sum"] for row in statistics] == [0, 3, 13, 23]
+        assert backfill.imported_count == 4
+        assert backfill.is_complete(account, "67890")
+        assert backfill.get_checkpoint(account, "67890") == date(2025, 2, 18)
+
+        # После первичной загрузки импортируются только новые строки
+        await coordinator.async_refresh()
+        await backfill._task
+        assert add_statistics.call_count == 1
+
+        # Новое показание за день отметки пересчитывает этот день, а замена
+        # счётчика не уменьшает сумму
+        meter = coordinator.data["1_12345"].meters["67890"]
+        await backfill._async_import_rows(
+            account,
+            meter,
+            [
+                MeterHistoryRow(meter_id="67890", date=date(2025, 2, 18), value=124),
+                MeterHistoryRow(meter_id="67890", date=date(2025, 2, 18), value=125),
+                MeterHistoryRow(meter_id="67890", date=date(2025, 3, 18), value=5),
+            ],
+        )
+        _, _, statistics = add_statistics.call_args.args
+        assert [(row["state"], row["sum"]) for row in statistics] == [
+            (125, 25),
+            (5, 25),
+        ]
+
+
+async def test_statistics_backfill_merges_pending_cycles(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Строки всех циклов, поступивших во время импорта, импортируются."""
+
+    from dataclasses import replace
+
+    entry_config = {**CONFIG_BASE, CONF_DEFAULT: {CONF_METER_HISTORY: True}}
+    hass.config.components.add("recorder")
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch(
+            "custom_components.guk_krasnodar._statistics.async_add_external_statistics"
+        ) as add_statistics,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: entry_config})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        backfill = coordinator.statistics_backfill
+        await backfill._task
+        add_statistics.reset_mock()
+
+        account_data = coordinator.data["1_12345"]
+
+        def _make_cycle(day: date, value: int):
+            row = MeterHistoryRow(meter_id="67890", date=day, value=value)
+            return {"1_12345": replace(account_data, meter_history={"67890": [row]})}
+
+        backfill.async_schedule(_make_cycle(date(2025, 3, 18), 130))
+        assert backfill.running
+        # Два цикла во время импорта
+        backfill.async_schedule(_make_cycle(date(2025, 4, 18), 140))
+        backfill.async_schedule(_make_cycle(date(2025, 5, 18), 150))
+        await backfill._task
+
+    imported = [
+        (row["state"], row["sum"])
+        for call in add_statistics.call_args_list
+        for row in call.args[2]
+    ]
+    assert imported == [(130, 30), (140, 40), (150, 50)]
+    assert backfill.get_checkpoint(account_data.account, "67890") == date(2025, 5, 18)
+
+
+async def test_snapshot_warm_startup(
+    hass: HomeAssistant, gukk_aioclient_mock, hass_storage
+) -> None:
+    """Объекты создаются из сохранённого снимка до обновления данных."""
+
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.guk_krasnodar._scheduler import DEFAULT_STARTUP_WINDOW
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        await hass.config_entries.async_unload(entry_id)
+        await hass.async_block_till_done()
+
+        snapshot = hass_storage[f"{DOMAIN}.{entry_id}.snapshot"]["data"]
+        assert len(snapshot["accounts"]) == 1
+        assert len(snapshot["accounts"][0]["meters"]) == 1
+
+        snapshot["accounts"][0]["account"]["balance"] = 999.99
+        accounts_calls = len(gukk_aioclient_mock.mock_calls)
+
+        assert await hass.config_entries.async_setup(entry_id)
+
+        # Авторизация и запросы к ЛК не блокируют настройку
+        assert len(gukk_aioclient_mock.mock_calls) == accounts_calls
+        assert hass.states.get("sensor.guk_krasnodar_1_12345_account").state == "999.99"
+
+        # Первичное обновление отложено в пределах окна запуска
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert len(gukk_aioclient_mock.mock_calls) == accounts_calls
+
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_STARTUP_WINDOW)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get("sensor.guk_krasnodar_1_12345_account").state == "1234.56"
+
+
+async def test_account_update_timeout(
+    hass: HomeAssistant, gukk_aioclient_mock, caplog
+) -> None:
+    """Медленный лицевой счёт не задерживает цикл обновления."""
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        previous_account_data = coordinator.data["1_12345"]
+        coordinator.final_config[CONF_ACCOUNT_TIMEOUT] = timedelta(seconds=0.05)
+
+        async def _slow_meters(account):
+            await asyncio.sleep(10)
+
+        with mock.patch.object(coordinator.api, "async_meters", _slow_meters):
+            await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["1_12345"] is previous_account_data
+    assert "Превышено время обновления лицевого счёта" in caplog.text
+    assert hass.states.get("sensor.guk_krasnodar_1_12345_meter_67890").state == "123"
+
+
+async def test_unchanged_state_write_skipped(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Состояние без изменений не записывается повторно."""
+
+    entity_id = "sensor.guk_krasnodar_1_12345_account"
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        last_updated = hass.states.get(entity_id).last_updated
+        skipped_state_writes = coordinator.skipped_state_writes
+
+        await coordinator.async_refresh()
+
+        # Оба объекта (лицевой счёт и счётчик) не изменились
+        assert coordinator.skipped_state_writes == skipped_state_writes + 2
+        assert hass.states.get(entity_id).last_updated == last_updated
+
+        info = [
+            {**row, "value": "5678.90"} if row["name"].startswith("Задолж") else row
+            for row in FIXTURE_ACCOUNT_DETAIL["info"]
+        ]
+        with mock.patch.dict(FIXTURE_ACCOUNT_DETAIL, {"info": info}):
+            await coordinator.async_refresh()
+
+    assert coordinator.skipped_state_writes == skipped_state_writes + 3
+    assert hass.states.get(entity_id).state == "5678.9"
+
+
+async def test_rendered_attributes_cached(
+    hass: HomeAssistant, gukk_aioclient_mock
+) -> None:
+    """Имя и атрибуты вычисляются один раз для снимка данных."""
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        coordinator = hass.data[DATA_COORDINATORS][entry_id]
+        entity = hass.data[DATA_ENTITIES][entry_id][GUKKrasnodarAccount]["1_12345"]
+
+        attributes = entity.extra_state_attributes
+        assert entity.extra_state_attributes is attributes
+        assert entity.sensor_related_attributes is entity.sensor_related_attributes
+
+        info = [
+            {**row, "value": "5678.90"} if row["name"].startswith("Задолж") else row
+            for row in FIXTURE_ACCOUNT_DETAIL["info"]
+        ]
+        with mock.patch.dict(FIXTURE_ACCOUNT_DETAIL, {"info": info}):
+            await coordinator.async_refresh()
+
+    assert entity.extra_state_attributes is not attributes
+    assert entity.extra_state_attributes[ATTR_BALANCE] == 5678.9
+
+
+@pytest.mark.parametrize("accounts_count", [2, 3])
+async def test_new_entities_added_in_batch(
+    hass: HomeAssistant, gukk_aioclient_mock, caplog, accounts_count: int
+) -> None:
+    """Новые объекты всех лицевых счетов добавляются одним вызовом на платформу."""
+
+    from custom_components.guk_krasnodar import sensor
+
+    caplog.set_level(logging.DEBUG, logger="custom_components.guk_krasnodar")
+
+    account = FIXTURE_ACCOUNTS["accounts"][0]
+    accounts = [
+        {**account, "id_account": account["id_account"] + index}
+        for index in range(accounts_count)
+    ]
+
+    add_calls = []
+    async_setup_entry = sensor.async_setup_entry
+
+    async def _async_setup_entry(hass, config_entry, async_add_entities):
+        def _async_add_entities(new_entities, update_before_add=False):
+            new_entities = list(new_entities)
+            if any(
+                isinstance(entity, (GUKKrasnodarAccount, GUKKrasnodarMeter))
+                for entity in new_entities
+            ):
+                add_calls.append(new_entities)
+            async_add_entities(new_entities, update_before_add)
+
+        await async_setup_entry(hass, config_entry, _async_add_entities)
+
+    with (
+        mock_gukk_aiohttp_client(hass, gukk_aioclient_mock),
+        mock.patch.dict(FIXTURE_ACCOUNTS, {"accounts": accounts}),
+        mock.patch.object(sensor, "async_setup_entry", _async_setup_entry),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Лицевой счёт и счётчик каждого лицевого счёта
+    assert len(add_calls) == 1
+    assert len(add_calls[0]) == 2 * accounts_count
+    for index in range(accounts_count):
+        code = f"1_{account['id_account'] + index}"
+        assert hass.states.get(f"sensor.guk_krasnodar_{code}_account")
+        assert hass.states.get(f"sensor.guk_krasnodar_{code}_meter_67890")
+
+    added_messages = [
+        record.getMessage()
+        for record in caplog.records
+        if "Добавлено новых объектов" in record.getMessage()
+    ]
+    assert added_messages == [
+        f"[u***e@d***u][refresh] Добавлено новых объектов: {2 * accounts_count}"
+    ]
+
+
+async def test_entity_registry_index(hass: HomeAssistant, gukk_aioclient_mock) -> None:
+    """Объекты доступны по ключу, идентификатору и коду и удаляются из индекса."""
+
+    entity_id = "sensor.guk_krasnodar_1_12345_meter_67890"
+
+    with mock_gukk_aiohttp_client(hass, gukk_aioclient_mock):
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: CONFIG_BASE.copy()})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    entities = hass.data[DATA_ENTITIES][entry_id]
+
+    entity = entities.get_by_entity_id(entity_id)
+    assert isinstance(entity, GUKKrasnodarMeter)
+    assert entities.get(GUKKrasnodarMeter, ("1_12345", "67890")) is entity
+    assert entities.get_by_code(CONF_METERS, "67890") is entity
+    assert len(entities) == 2
+
+    await entity.async_remove()
+
+    assert entities.get_by_entity_id(entity_id) is None
+    assert entities.get(GUKKrasnodarMeter, ("1_12345", "67890")) is None
+    assert entities.get_by_code(CONF_METERS, "67890") is None
+    assert len(entities) == 1
+
+    # Одинаковые коды счётчиков разных лицевых счетов
+    from custom_components.guk_krasnodar._registry import EntityRegistry
+
+    class _Meter:
+        config_key = CONF_METERS
+        code = "67890"
+        entity_id = None
+
+    registry = EntityRegistry()
+    first, second = _Meter(), _Meter()
+    registry.add(first, ("1_12345", "67890"))
+    registry.add(second, ("1_54321", "67890"))
+    assert registry.get_by_code(CONF_METERS, "67890") is first
+
+    registry.remove(first)
+    assert registry.get_by_code(CONF_METERS, "67890") is second
+    registry.remove(second)
+    assert registry.get_by_code(CONF_METERS, "67890") is None